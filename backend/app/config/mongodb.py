@@ -1,5 +1,8 @@
 import os
+import time
+import threading
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -8,9 +11,168 @@ load_dotenv()
 MONGODB_URL = os.getenv("MONGODB_URL")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "fake_news_detection")
 
-# Create MongoDB client
-client = AsyncIOMotorClient(MONGODB_URL)
-db = client[DATABASE_NAME]
+# Connection pool and timeout settings
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
+MONGODB_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
+MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "30000"))
+MONGODB_READ_PREFERENCE = os.getenv("MONGODB_READ_PREFERENCE", "primary")
+
+# Smoothing of the pool checkout wait average
+CHECKOUT_WAIT_SMOOTHING = 0.1
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """
+    Measure how long operations wait to check a connection out of the pool.
+
+    Check-out start and completion are reported on the same thread, so the
+    start time is kept in a thread-local.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.checked_out = 0
+        self.open_connections = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.avg_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def snapshot(self, reset_max=False):
+        with self._lock:
+            result = {
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "max_pool_size": MONGODB_MAX_POOL_SIZE,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_checkout_wait_ms": round(self.avg_wait_ms, 2),
+                "max_checkout_wait_ms": round(self.max_wait_ms, 2)
+            }
+            if reset_max:
+                self.max_wait_ms = 0.0
+        return result
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "started", None)
+        wait_ms = (time.perf_counter() - started) * 1000 if started else 0.0
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.avg_wait_ms += CHECKOUT_WAIT_SMOOTHING * (wait_ms - self.avg_wait_ms)
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+
+pool_monitor = PoolMonitor()
+_client = None
+
+
+def get_client():
+    """
+    The shared Motor client, created on first use.
+
+    The API creates it in its lifespan (connect_mongodb); scripts get it
+    lazily the first time a collection is used.
+    """
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            MONGODB_URL,
+            maxPoolSize=MONGODB_MAX_POOL_SIZE,
+            minPoolSize=MONGODB_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGODB_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=MONGODB_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=MONGODB_SOCKET_TIMEOUT_MS,
+            readPreference=MONGODB_READ_PREFERENCE,
+            event_listeners=[pool_monitor]
+        )
+    return _client
+
+
+def get_database():
+    return get_client()[DATABASE_NAME]
+
+
+async def ping():
+    """Round-trip a ping to the server and return its latency in milliseconds"""
+    started = time.perf_counter()
+    await get_database().command("ping")
+    return (time.perf_counter() - started) * 1000
+
+
+async def connect_mongodb():
+    """Create the client and check that the server is reachable"""
+    latency_ms = await ping()
+    print(f"Connected to MongoDB ({latency_ms:.1f} ms ping)")
+
+
+def close_mongodb():
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+class _Lazy:
+    """Stand-in for a database or collection that resolves it on each use"""
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __getitem__(self, name):
+        return self._resolve()[name]
+
+
+db = _Lazy(get_database)
 
 # Collections
-reports_collection = db.reports 
\ No newline at end of file
+reports_collection = _Lazy(lambda: get_database().reports)
+bodies_collection = _Lazy(lambda: get_database().report_bodies)
+archive_collection = _Lazy(lambda: get_database().reports_archive)
+rollups_collection = _Lazy(lambda: get_database().report_rollups)
+metadata_collection = _Lazy(lambda: get_database().metadata)
+idempotency_collection = _Lazy(lambda: get_database().idempotency_keys)
@@ -1,17 +1,54 @@
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
 import os
 from dotenv import load_dotenv
-from .routers import news, reports
+from .routers import news, reports, health
+from .config.mongodb import connect_mongodb, close_mongodb
+from .utils.executors import shutdown_executors
+from .services.event_service import start_change_stream, stop_change_stream
+from .services.search_service import ensure_search_indexes
+from .services.report_service import ensure_report_indexes
+from .services.rollup_service import ensure_rollup_indexes
+from .services.idempotency_service import ensure_idempotency_indexes
+from .services.retention_service import ensure_archive_indexes, start_compaction, stop_compaction
+from .services.gemini_service import TRANSPORT
 from fastapi.staticfiles import StaticFiles
 
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app):
+    # Fail fast if MongoDB is unreachable
+    await connect_mongodb()
+    # Build the indexes behind verdict lookups and /api/search
+    await ensure_report_indexes()
+    await ensure_search_indexes()
+    await ensure_archive_indexes()
+    await ensure_rollup_indexes()
+    # Expire stored Idempotency-Key responses
+    await ensure_idempotency_indexes()
+    # Feed /api/stream from inserts made by every worker
+    start_change_stream()
+    # Move reports older than the hot window into the archive
+    start_compaction()
+    
+    yield
+    
+    await stop_change_stream()
+    await stop_compaction()
+    # Release the Gemini thread pool and chart rendering processes
+    shutdown_executors()
+    # Finish the Gemini cassette when recording
+    TRANSPORT.close()
+    close_mongodb()
+
 app = FastAPI(
     title="Fake News Detection API",
     description="API for detecting fake news using Gemini AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Update CORS settings
@@ -29,6 +66,7 @@ app.add_middleware(
 # Include routers
 app.include_router(news.router, prefix="/api", tags=["News"])
 app.include_router(reports.router, prefix="/api", tags=["Reports"])
+app.include_router(health.router, tags=["Health"])
 
 # Mount static directory for charts
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
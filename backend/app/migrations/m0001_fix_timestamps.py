@@ -0,0 +1,26 @@
+"""
+Store report timestamps as BSON dates.
+
+Replaces scripts/fix_timestamps.py, which loaded every report and made them
+timezone-aware one update_one at a time. BSON dates are always UTC, so the
+only timestamps that actually need fixing are ones stored as ISO strings.
+They are converted server-side with a single update pipeline.
+"""
+
+VERSION = 1
+NAME = "fix_timestamps"
+
+STRING_TIMESTAMPS = {"timestamp": {"$type": "string"}}
+
+
+async def count_pending(db):
+    return await db.reports.count_documents(STRING_TIMESTAMPS)
+
+
+async def migrate(db, ctx):
+    # Strings without an offset are read as UTC, matching add_news_to_report
+    result = await db.reports.update_many(
+        STRING_TIMESTAMPS,
+        [{"$set": {"timestamp": {"$dateFromString": {"dateString": "$timestamp"}}}}]
+    )
+    await ctx.save_checkpoint(None, result.matched_count, result.modified_count)
@@ -0,0 +1,41 @@
+"""
+Move content, explanation and analysis out of report documents.
+
+The text is compressed into report_bodies under the same _id, leaving the
+reports collection with small, fixed-shape documents. Bodies are upserted
+before the fields are unset, so an interrupted run can be resumed.
+"""
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import OperationFailure
+from ..services.body_service import split_report, BODY_FIELDS
+
+VERSION = 2
+NAME = "split_report_bodies"
+
+INLINE_BODIES = {"content": {"$exists": True}}
+LEGACY_TEXT_INDEX = "reports_text"
+
+
+async def count_pending(db):
+    return await db.reports.count_documents(INLINE_BODIES)
+
+
+async def migrate(db, ctx):
+    from .runner import batched_bulk_write
+
+    async def build_ops(reports):
+        bodies = [split_report(report)[1] for report in reports]
+        await db.report_bodies.bulk_write(
+            [ReplaceOne({"_id": body["_id"]}, body, upsert=True) for body in bodies],
+            ordered=False
+        )
+        unset = {field: "" for field in BODY_FIELDS}
+        return [UpdateOne({"_id": report["_id"]}, {"$unset": unset}) for report in reports]
+
+    await batched_bulk_write(db.reports, INLINE_BODIES, build_ops, ctx)
+
+    # Search now uses the text index on report_bodies
+    try:
+        await db.reports.drop_index(LEGACY_TEXT_INDEX)
+    except OperationFailure:
+        pass
@@ -0,0 +1,15 @@
+"""
+Add reports stored before the rollups existed to the statistics rollups.
+"""
+from ..services.rollup_service import count_unrolled, backfill_rollups
+
+VERSION = 3
+NAME = "rollup_reports"
+
+
+async def count_pending(db):
+    return await count_unrolled(db.reports)
+
+
+async def migrate(db, ctx):
+    await backfill_rollups(db.reports, ctx, VERSION)
@@ -0,0 +1,15 @@
+"""
+Add archived reports stored before the rollups existed to the statistics rollups.
+"""
+from ..services.rollup_service import count_unrolled, backfill_rollups
+
+VERSION = 4
+NAME = "rollup_archive"
+
+
+async def count_pending(db):
+    return await count_unrolled(db.reports_archive)
+
+
+async def migrate(db, ctx):
+    await backfill_rollups(db.reports_archive, ctx, VERSION)
@@ -0,0 +1,30 @@
+"""
+Store search terms on archived reports.
+
+Archived reports were searchable by title only. Compaction now stores the
+distinct words of content and explanation as "terms", covered by the archive
+text index like report_bodies; this adds them to reports archived earlier.
+"""
+from pymongo import UpdateOne
+from ..services.body_service import report_terms, decompress_text
+
+VERSION = 5
+NAME = "archive_terms"
+
+MISSING_TERMS = {"terms": {"$exists": False}}
+
+
+async def count_pending(db):
+    return await db.reports_archive.count_documents(MISSING_TERMS)
+
+
+async def migrate(db, ctx):
+    from .runner import batched_bulk_write
+
+    def build_ops(docs):
+        return [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {"terms": report_terms(decompress_text(doc["text"]))}})
+            for doc in docs
+        ]
+
+    await batched_bulk_write(db.reports_archive, MISSING_TERMS, build_ops, ctx, projection={"text": 1})
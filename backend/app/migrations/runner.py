@@ -0,0 +1,134 @@
+import time
+import inspect
+import pytz
+from datetime import datetime
+from pymongo import ASCENDING
+from ..config.mongodb import db
+from . import (
+    m0001_fix_timestamps, m0002_split_report_bodies, m0003_rollup_reports, m0004_rollup_archive, m0005_archive_terms
+)
+
+# Migrations in the order they must be applied. Each module defines VERSION,
+# NAME, count_pending(db) for dry runs and migrate(db, ctx) to apply it.
+MIGRATIONS = [
+    m0001_fix_timestamps,
+    m0002_split_report_bodies,
+    m0003_rollup_reports,
+    m0004_rollup_archive,
+    m0005_archive_terms,
+]
+
+MIGRATION_BATCH_SIZE = 1000
+
+
+class MigrationContext:
+    """Checkpoint and progress tracking for one running migration"""
+
+    def __init__(self, migration, record):
+        self.migration = migration
+        self.checkpoint = record.get("checkpoint") if record else None
+        self.processed = record.get("processed", 0) if record else 0
+        self.modified = record.get("modified", 0) if record else 0
+        self.started = time.monotonic()
+        self._start_processed = self.processed
+
+    async def save_checkpoint(self, checkpoint, processed, modified):
+        """Record progress so an interrupted migration resumes after checkpoint"""
+        self.checkpoint = checkpoint
+        self.processed += processed
+        self.modified += modified
+        await db.migrations.update_one(
+            {"_id": self.migration.VERSION},
+            {"$set": {
+                "checkpoint": checkpoint,
+                "processed": self.processed,
+                "modified": self.modified
+            }}
+        )
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        print(f"  {self.processed} documents processed, {self.modified} modified "
+              f"({(self.processed - self._start_processed) / elapsed:.0f} docs/s)")
+
+
+async def batched_bulk_write(collection, query, build_ops, ctx, batch_size=MIGRATION_BATCH_SIZE, projection=None):
+    """
+    Apply bulk_write batches to the documents matching query, in _id order.
+
+    build_ops(docs) returns (or, as a coroutine, resolves to) the write
+    operations for one batch; any writes it makes to other collections must
+    be idempotent. The last _id of every batch is saved as the checkpoint,
+    so a rerun continues after the last completed batch.
+    """
+    while True:
+        batch_query = dict(query)
+        if ctx.checkpoint is not None:
+            batch_query["_id"] = {**query.get("_id", {}), "$gt": ctx.checkpoint}
+        docs = await collection.find(batch_query, projection).sort("_id", ASCENDING).limit(batch_size).to_list(length=batch_size)
+        if not docs:
+            return
+
+        ops = build_ops(docs)
+        if inspect.isawaitable(ops):
+            ops = await ops
+        modified = 0
+        if ops:
+            result = await collection.bulk_write(ops, ordered=False)
+            modified = result.modified_count + result.upserted_count + result.inserted_count
+        await ctx.save_checkpoint(docs[-1]["_id"], len(docs), modified)
+
+        if len(docs) < batch_size:
+            return
+
+
+async def run_migrations(dry_run=False, target=None):
+    """
+    Apply pending migrations up to the target version (all by default).
+
+    With dry_run, only report how many documents each pending migration
+    would change.
+    """
+    applied = {
+        record["_id"]: record
+        async for record in db.migrations.find({})
+    }
+
+    for migration in MIGRATIONS:
+        if target is not None and migration.VERSION > target:
+            break
+        record = applied.get(migration.VERSION)
+        if record and record.get("status") == "applied":
+            continue
+
+        label = f"{migration.VERSION:04d}_{migration.NAME}"
+        pending = await migration.count_pending(db)
+        if dry_run:
+            print(f"[dry run] {label}: {pending} documents to migrate")
+            continue
+
+        if record:
+            print(f"Resuming {label} ({pending} documents left)...")
+        else:
+            print(f"Applying {label} ({pending} documents to migrate)...")
+        await db.migrations.update_one(
+            {"_id": migration.VERSION},
+            {
+                "$set": {"name": migration.NAME, "status": "running"},
+                "$setOnInsert": {"started_at": datetime.now(pytz.UTC)}
+            },
+            upsert=True
+        )
+
+        ctx = MigrationContext(migration, record)
+        started = time.monotonic()
+        await migration.migrate(db, ctx)
+        duration = time.monotonic() - started
+
+        await db.migrations.update_one(
+            {"_id": migration.VERSION},
+            {"$set": {
+                "status": "applied",
+                "applied_at": datetime.now(pytz.UTC),
+                "duration_seconds": round(duration, 2)
+            }}
+        )
+        print(f"Applied {label} in {duration:.1f}s: {ctx.processed} processed, {ctx.modified} modified")
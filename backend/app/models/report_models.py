@@ -5,11 +5,12 @@ from datetime import datetime
 class NewsReport(BaseModel):
     id: Optional[str] = None
     title: str
-    content: str
+    content: Optional[str] = None  # stored in report_bodies; omitted from list views
     source: Optional[str] = None
     is_fake: bool
     confidence: float
-    explanation: str
+    explanation: Optional[str] = None  # stored in report_bodies; omitted from list views
+    analysis: Optional[Dict[str, str]] = None  # detailed analysis sections, when requested
     timestamp: Optional[datetime] = None
     
     class Config:
@@ -17,6 +18,13 @@ class NewsReport(BaseModel):
 
 class NewsList(BaseModel):
     items: List[NewsReport]
+
+class SearchHit(NewsReport):
+    score: Optional[float] = None  # text relevance, higher is better
+
+class SearchResults(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None  # pass as "cursor" to fetch the next page
     
 class StatCount(BaseModel):
     real: int
@@ -29,12 +37,26 @@ class ConfidenceStats(BaseModel):
     max: float
     distribution: Dict[str, int]  # ranges like "0-0.2", "0.2-0.4", etc. with counts
 
+class QuantileStats(BaseModel):
+    count: int
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+
 class ReportStatistics(BaseModel):
     total_count: StatCount
     recent_count: StatCount
     by_source: Dict[str, StatCount]
     confidence_stats: ConfidenceStats
     daily_counts: Dict[str, StatCount]  # date string to counts
+    # Sketch estimates for the requested period. Confidence quantiles are
+    # within 1% relative error of a value at that rank (values <= 0.001 read
+    # as 0); distinct source counts have a standard error of about 3.25%.
+    confidence_quantiles: Optional[QuantileStats] = None
+    daily_confidence: Dict[str, QuantileStats] = {}  # date string to quantiles
+    source_confidence: Dict[str, QuantileStats] = {}  # source to quantiles
+    distinct_sources: int = 0
+    daily_distinct_sources: Dict[str, int] = {}  # date string to distinct sources
     
 class ChartData(BaseModel):
     chart_type: str
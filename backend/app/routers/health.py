@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from ..services.health_service import check_readiness
+
+router = APIRouter()
+
+@router.get("/healthz")
+async def healthz():
+    """
+    Liveness probe: the process is up and serving requests
+    """
+    return {"status": "ok"}
+
+@router.get("/readyz")
+async def readyz():
+    """
+    Readiness probe with MongoDB ping latency, connection pool checkout wait
+    and Gemini key breaker state
+
+    Responds 503 when MongoDB or the pool check fails, so the load balancer
+    stops routing to this instance. The Gemini breaker state is informational.
+    """
+    ready, checks = await check_readiness()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "degraded", "checks": checks}
+    )
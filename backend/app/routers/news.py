@@ -1,12 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Header
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict
 import json
-from ..services.gemini_service import classify_news, analyze_news_content
+from ..services.gemini_service import classify_news, classify_and_analyze_news, analyze_news_content, gemini_admission
+from ..services.quota_ledger import QuotaExhausted
 from ..services.report_service import add_news_to_report
+from ..services.idempotency_service import (
+    run_idempotent, request_fingerprint, IdempotencyKeyReused, IdempotencyInProgress
+)
+from ..utils.executors import ExecutorSaturated
+from ..utils.admission import AdmissionRejected, INTERACTIVE, ANALYZE, BULK
 
 router = APIRouter()
 
+def client_id(request: Request):
+    """Identify the caller for per-client fair queuing"""
+    return request.client.host if request.client else "unknown"
+
+IDEMPOTENCY_KEY_HEADER = Header(
+    None,
+    alias="Idempotency-Key",
+    description="Client-chosen key; retries with the same key return the first result instead of analyzing again"
+)
+
+async def run_with_idempotency(scope, key, fingerprint, func):
+    """Run func once per Idempotency-Key, or every time when no key is sent"""
+    if not key:
+        return await func()
+    try:
+        return await run_idempotent(scope, key, fingerprint, func)
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def too_many_requests(error):
+    """429 response for work rejected by admission control or the API key quota"""
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
 class NewsRequest(BaseModel):
     title: str
     content: str
@@ -19,15 +54,28 @@ class NewsResponse(BaseModel):
     title: str
     content: str
     source: Optional[str] = None
+    analysis: Optional[Dict[str, str]] = None
 
 @router.post("/detect", response_model=NewsResponse)
-async def detect_fake_news(news: NewsRequest):
+async def detect_fake_news(
+    news: NewsRequest,
+    request: Request,
+    include_analysis: bool = Query(False, description="Also return the detailed analysis, from the same Gemini call"),
+    idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER
+):
     """
     Detect if the provided news is fake or real using Gemini AI
     """
-    try:
+    async def process():
         # Process the news content with Gemini AI
-        is_fake, confidence, explanation = await classify_news(news.title, news.content)
+        analysis = None
+        async with gemini_admission(INTERACTIVE, client_id(request)):
+            if include_analysis:
+                is_fake, confidence, explanation, analysis = await classify_and_analyze_news(
+                    news.title, news.content, allow_fallback=False
+                )
+            else:
+                is_fake, confidence, explanation = await classify_news(news.title, news.content, allow_fallback=False)
         
         # Create the response
         response = NewsResponse(
@@ -36,7 +84,8 @@ async def detect_fake_news(news: NewsRequest):
             explanation=explanation,
             title=news.title,
             content=news.content,
-            source=news.source
+            source=news.source,
+            analysis=analysis
         )
         
         # Add the result to the reports database
@@ -46,26 +95,46 @@ async def detect_fake_news(news: NewsRequest):
             news.source, 
             is_fake, 
             confidence, 
-            explanation
+            explanation,
+            analysis=analysis
         )
         
-        return response
+        return response.dict()
+    
+    try:
+        fingerprint = request_fingerprint(news.dict(), include_analysis)
+        return await run_with_idempotency("detect", idempotency_key, fingerprint, process)
+    except HTTPException:
+        raise
+    except (AdmissionRejected, QuotaExhausted) as e:
+        raise too_many_requests(e)
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing news: {str(e)}")
 
 @router.post("/analyze")
-async def analyze_news(text: str = Form(...)):
+async def analyze_news(request: Request, text: str = Form(...)):
     """
     Analyze news content and provide detailed insights
     """
     try:
-        analysis = await analyze_news_content(text)
+        async with gemini_admission(ANALYZE, client_id(request)):
+            analysis = await analyze_news_content(text, allow_fallback=False)
         return {"analysis": analysis}
+    except (AdmissionRejected, QuotaExhausted) as e:
+        raise too_many_requests(e)
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error analyzing news: {str(e)}")
 
 @router.post("/upload")
-async def upload_news_file(file: UploadFile = File(...)):
+async def upload_news_file(
+    request: Request,
+    file: UploadFile = File(...),
+    idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER
+):
     """
     Upload and analyze a news file (txt, doc, pdf)
     """
@@ -76,25 +145,36 @@ async def upload_news_file(file: UploadFile = File(...)):
         # Extract title from filename
         title = file.filename.split(".")[0].replace("_", " ").title()
         
-        # Process with Gemini AI
-        is_fake, confidence, explanation = await classify_news(title, text_content)
-        
-        # Add to reports
-        await add_news_to_report(
-            title, 
-            text_content, 
-            f"Uploaded file: {file.filename}", 
-            is_fake, 
-            confidence, 
-            explanation
-        )
+        async def process():
+            # Process with Gemini AI, behind interactive and analyze requests
+            async with gemini_admission(BULK, client_id(request)):
+                is_fake, confidence, explanation = await classify_news(title, text_content, allow_fallback=False)
+            
+            # Add to reports
+            await add_news_to_report(
+                title, 
+                text_content, 
+                f"Uploaded file: {file.filename}", 
+                is_fake, 
+                confidence, 
+                explanation
+            )
+            
+            return {
+                "is_fake": is_fake,
+                "confidence": confidence,
+                "explanation": explanation,
+                "title": title,
+                "filename": file.filename
+            }
         
-        return {
-            "is_fake": is_fake,
-            "confidence": confidence,
-            "explanation": explanation,
-            "title": title,
-            "filename": file.filename
-        }
+        fingerprint = request_fingerprint(file.filename, content)
+        return await run_with_idempotency("upload", idempotency_key, fingerprint, process)
+    except HTTPException:
+        raise
+    except (AdmissionRejected, QuotaExhausted) as e:
+        raise too_many_requests(e)
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
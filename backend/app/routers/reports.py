@@ -1,11 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime, timedelta
 import json
 import logging
 import traceback
-from ..services.report_service import get_report_statistics, get_recent_reports, generate_chart
-from ..models.report_models import ReportStatistics, NewsList
+from ..services.report_service import get_report_statistics, get_statistics_etag, get_recent_reports, get_report, generate_chart
+from ..services.event_service import broadcaster, TooManySubscribers
+from ..services.search_service import search_reports, InvalidSearchCursor
+from ..services.transfer_service import iter_export_lines
+from ..models.report_models import ReportStatistics, NewsList, NewsReport, SearchResults
+from ..utils.executors import ExecutorSaturated
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -15,13 +20,26 @@ router = APIRouter()
 
 @router.get("/statistics", response_model=ReportStatistics)
 async def get_statistics(
+    request: Request,
+    response: Response,
     days: Optional[int] = Query(7, description="Number of days to include in statistics")
 ):
     """
     Get statistics about fake news detection results
+
+    Responses carry an ETag so clients can revalidate with If-None-Match
+    and receive 304 Not Modified while the data is unchanged.
     """
     try:
-        stats = await get_report_statistics(days)
+        etag = await get_statistics_etag(days)
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=cache_headers)
+        
+        stats = await get_report_statistics(days, etag=etag)
+        response.headers.update(cache_headers)
         return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving statistics: {str(e)}")
@@ -29,14 +47,18 @@ async def get_statistics(
 @router.get("/recent", response_model=NewsList)
 async def get_latest_reports(
     limit: int = Query(10, description="Number of reports to return"),
-    fake_only: bool = Query(False, description="Return only fake news reports")
+    fake_only: bool = Query(False, description="Return only fake news reports"),
+    include_body: bool = Query(False, description="Include content, explanation and analysis")
 ):
     """
     Get the most recent news reports processed by the system
+
+    Without include_body only the report summaries are returned; use
+    /reports/{report_id} for the full text of one report.
     """
     try:
         logger.info(f"Fetching recent reports. Limit: {limit}, Fake only: {fake_only}")
-        reports = await get_recent_reports(limit, fake_only)
+        reports = await get_recent_reports(limit, fake_only, include_body=include_body)
         logger.info(f"Retrieved {len(reports)} reports")
         
         # Log the first report for debugging (if available)
@@ -49,6 +71,84 @@ async def get_latest_reports(
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f"Error retrieving reports: {str(e)}")
 
+@router.get("/reports/{report_id}", response_model=NewsReport)
+async def get_report_detail(report_id: str):
+    """
+    Get one report with its content, explanation and analysis
+    """
+    report = await get_report(report_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return report
+
+@router.get("/search", response_model=SearchResults)
+async def search(
+    q: str = Query(..., min_length=1, description="Words to search for in title, content and explanation"),
+    is_fake: Optional[bool] = Query(None, description="Only return fake (true) or real (false) news"),
+    source: Optional[str] = Query(None, description="Only return reports from this source"),
+    start: Optional[datetime] = Query(None, description="Only return reports stored at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only return reports stored before this time"),
+    sort: str = Query("relevance", description="Sort order: relevance or recent"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
+    """
+    Search stored reports
+
+    Results are paginated with a keyset cursor, so later pages cost the
+    same as the first one.
+    """
+    if sort not in ("relevance", "recent"):
+        raise HTTPException(status_code=400, detail="Invalid sort. Must be one of: relevance, recent")
+    try:
+        items, next_cursor = await search_reports(
+            q, is_fake=is_fake, source=source, start=start, end=end,
+            sort=sort, limit=limit, cursor=cursor
+        )
+        return {"items": items, "next_cursor": next_cursor}
+    except InvalidSearchCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching reports: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error searching reports: {str(e)}")
+
+@router.get("/export")
+async def export_reports(
+    include_archive: bool = Query(True, description="Include reports moved to the archive")
+):
+    """
+    Export all reports as newline-delimited JSON
+
+    The response is streamed from the database cursor, so memory use does
+    not grow with the number of reports.
+    """
+    filename = f"reports-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.ndjson"
+    return StreamingResponse(
+        iter_export_lines(include_archive=include_archive),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/stream")
+async def stream_reports(request: Request):
+    """
+    Server-sent event stream of newly stored reports
+
+    Each "report" event carries a report summary and the counter deltas it
+    adds to the statistics. A "resync" event means events were dropped
+    because the client fell behind, so it should refetch /api/statistics.
+    """
+    try:
+        subscription = broadcaster.subscribe()
+    except TooManySubscribers as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return StreamingResponse(
+        broadcaster.stream(subscription, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/chart/{chart_type}")
 async def get_chart(
     chart_type: str,
@@ -77,5 +177,7 @@ async def get_chart(
         return Response(content=chart_data, media_type="image/png")
     except HTTPException as he:
         raise he
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating chart: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,119 @@
+import re
+import json
+import zlib
+import hashlib
+from bson import Binary
+from pymongo.errors import BulkWriteError
+from ..config.mongodb import reports_collection, bodies_collection
+from .rollup_service import record_rollups
+
+# Report documents keep only small, fixed-shape fields. The heavy text lives in
+# report_bodies under the same _id, compressed, and is loaded for detail views.
+BODY_FIELDS = ["content", "explanation", "analysis"]
+DUPLICATE_KEY_ERROR = 11000
+# Weights of the text indexes on report_bodies and reports_archive, which both
+# hold the title and the distinct words ("terms") of content and explanation
+TEXT_INDEX_WEIGHTS = {"title": 10, "terms": 2}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in",
+    "is", "it", "of", "on", "or", "that", "the", "this", "to", "was", "were", "with"
+}
+
+
+def tokenize(text):
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def report_terms(report):
+    """Distinct words of a report's content and explanation, stored uncompressed for text search"""
+    words = dict.fromkeys(tokenize(report.get("content")) + tokenize(report.get("explanation")))
+    return " ".join(words)
+
+
+def content_hash(title, content):
+    """Fingerprint of the full article text, used to recognize repeated articles"""
+    return hashlib.sha256(f"{title}\n{content}".encode("utf-8")).hexdigest()
+
+
+def compress_text(fields):
+    return Binary(zlib.compress(json.dumps(fields).encode("utf-8"), 6))
+
+
+def decompress_text(data):
+    return json.loads(zlib.decompress(data).decode("utf-8"))
+
+
+def ignore_duplicates(error):
+    """Re-raise a BulkWriteError unless every failure is a duplicate key"""
+    if any(err.get("code") != DUPLICATE_KEY_ERROR for err in error.details.get("writeErrors", [])):
+        raise error
+
+
+def split_report(report):
+    """
+    Split a full report into its small report document and its body document.
+
+    The body repeats the fields search filters on, and stores the distinct
+    words of the text uncompressed so a text index can cover them.
+    """
+    summary = {k: v for k, v in report.items() if k not in BODY_FIELDS and k != "id"}
+    body = {
+        "_id": report["_id"],
+        "title": report.get("title"),
+        "source": report.get("source"),
+        "is_fake": report.get("is_fake"),
+        "timestamp": report.get("timestamp"),
+        "terms": report_terms(report),
+        "text": compress_text({field: report.get(field) for field in BODY_FIELDS})
+    }
+    return summary, body
+
+
+async def insert_reports(reports):
+    """
+    Store full reports in the split layout. Each report must already have an _id.
+
+    Bodies are written first, so a report document never exists without its
+    body. Reports that are already stored are skipped; new ones are added
+    to the statistics rollups and marked rolled_up.
+    Returns the number of new report documents.
+    """
+    if not reports:
+        return 0
+    summaries, bodies = zip(*(split_report(report) for report in reports))
+    for summary in summaries:
+        summary["rolled_up"] = True
+    try:
+        await bodies_collection.insert_many(list(bodies), ordered=False)
+    except BulkWriteError as e:
+        ignore_duplicates(e)
+    inserted = list(summaries)
+    try:
+        await reports_collection.insert_many(inserted, ordered=False)
+    except BulkWriteError as e:
+        ignore_duplicates(e)
+        duplicates = {err["index"] for err in e.details.get("writeErrors", [])}
+        inserted = [s for i, s in enumerate(summaries) if i not in duplicates]
+    await record_rollups(inserted)
+    return len(inserted)
+
+
+async def load_bodies(ids):
+    """Load and decompress the bodies of the given report ids"""
+    if not ids:
+        return {}
+    cursor = bodies_collection.find({"_id": {"$in": list(ids)}}, {"text": 1})
+    return {doc["_id"]: decompress_text(doc["text"]) async for doc in cursor}
+
+
+async def attach_bodies(reports):
+    """Fill in content, explanation and analysis for reports stored in the split layout"""
+    missing = [r["_id"] for r in reports if "content" not in r]
+    bodies = await load_bodies(missing)
+    for report in reports:
+        body = bodies.get(report["_id"])
+        if body:
+            report.update({k: v for k, v in body.items() if v is not None})
+    return reports
@@ -0,0 +1,165 @@
+import os
+import json
+import asyncio
+import pytz
+from pymongo.errors import PyMongoError
+from dotenv import load_dotenv
+from ..config.mongodb import reports_collection
+
+# Load environment variables
+load_dotenv()
+
+# Each subscriber gets a bounded queue. A subscriber that falls behind has its
+# backlog replaced by a single "resync" event, and is disconnected after
+# STREAM_MAX_LAGS resyncs in a row without catching up.
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "64"))
+STREAM_MAX_LAGS = int(os.getenv("STREAM_MAX_LAGS", "3"))
+STREAM_MAX_SUBSCRIBERS = int(os.getenv("STREAM_MAX_SUBSCRIBERS", "5000"))
+STREAM_HEARTBEAT_SECONDS = 15
+
+_RESYNC_FRAME = "event: resync\ndata: {}\n\n"
+_CLOSE = None
+
+
+class TooManySubscribers(Exception):
+    """Raised when the stream already has the maximum number of subscribers"""
+
+
+class Subscription:
+    """One connected client of the event stream"""
+
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self.lags = 0
+
+    def offer(self, frame):
+        """Queue a frame without blocking. Returns False if the client should be dropped"""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        # Coalesce the backlog into one resync so the client refetches a snapshot
+        self.lags += 1
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        if self.lags > STREAM_MAX_LAGS:
+            self.queue.put_nowait(_CLOSE)
+            return False
+        self.queue.put_nowait(_RESYNC_FRAME)
+        return True
+
+
+class EventBroadcaster:
+    """In-process fan-out of server-sent events to all subscribers"""
+
+    def __init__(self):
+        self.subscribers = set()
+
+    def subscribe(self):
+        if len(self.subscribers) >= STREAM_MAX_SUBSCRIBERS:
+            raise TooManySubscribers(f"Stream is full ({STREAM_MAX_SUBSCRIBERS} subscribers)")
+        subscription = Subscription()
+        self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscribers.discard(subscription)
+
+    def publish(self, event, data):
+        """Send an event to every subscriber. The payload is serialized once"""
+        frame = f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        for subscription in list(self.subscribers):
+            if not subscription.offer(frame):
+                self.unsubscribe(subscription)
+
+    async def stream(self, subscription, is_disconnected):
+        """Yield SSE frames for a subscription until the client goes away"""
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=STREAM_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        break
+                    yield ": ping\n\n"
+                    continue
+                if frame is _CLOSE:
+                    break
+                if subscription.queue.empty():
+                    # The client has caught up with everything queued for it
+                    subscription.lags = 0
+                yield frame
+        finally:
+            self.unsubscribe(subscription)
+
+
+broadcaster = EventBroadcaster()
+
+# Set while a MongoDB change stream feeds the broadcaster. In that mode every
+# worker sees inserts made by all workers, so inserts are not published locally.
+_change_stream_task = None
+
+
+def report_event(report):
+    """Build the payload broadcast for a newly stored report"""
+    timestamp = report.get("timestamp")
+    if timestamp and not timestamp.tzinfo:
+        timestamp = timestamp.replace(tzinfo=pytz.UTC)
+    return {
+        "report": {
+            "id": str(report.get("_id", report.get("id", ""))),
+            "title": report.get("title"),
+            "source": report.get("source"),
+            "is_fake": report.get("is_fake"),
+            "confidence": report.get("confidence"),
+            "timestamp": timestamp.isoformat() if timestamp else None
+        },
+        "delta": {
+            "total": 1,
+            "fake": 1 if report.get("is_fake") else 0,
+            "real": 0 if report.get("is_fake") else 1,
+            "source": report.get("source") or "Unknown",
+            "date": timestamp.strftime("%Y-%m-%d") if timestamp else None
+        }
+    }
+
+
+def publish_report(report):
+    """Broadcast a report inserted by this process, unless a change stream already covers it"""
+    if _change_stream_task is None or _change_stream_task.done():
+        broadcaster.publish("report", report_event(report))
+
+
+async def _watch_reports():
+    try:
+        pipeline = [{"$match": {"operationType": "insert"}}]
+        async with reports_collection.watch(pipeline) as change_stream:
+            print("Report stream is following the MongoDB change stream")
+            async for change in change_stream:
+                broadcaster.publish("report", report_event(change["fullDocument"]))
+    except PyMongoError as e:
+        # Standalone servers have no change streams; inserts are published locally instead
+        print(f"MongoDB change streams unavailable, publishing local inserts only: {e}")
+
+
+def start_change_stream():
+    """Follow inserts from every worker through a MongoDB change stream when supported"""
+    global _change_stream_task
+    if _change_stream_task is None:
+        _change_stream_task = asyncio.create_task(_watch_reports())
+
+
+async def stop_change_stream():
+    global _change_stream_task
+    if _change_stream_task is not None:
+        _change_stream_task.cancel()
+        try:
+            await _change_stream_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _change_stream_task = None
@@ -1,10 +1,15 @@
 import os
 import google.generativeai as genai
+from google.ai import generativelanguage as glm
 from dotenv import load_dotenv
 import json
 import asyncio
 import time
-import random
+import threading
+from ..utils.executors import get_gemini_executor
+from ..utils.admission import get_gemini_admission
+from .quota_ledger import QuotaLedger, QuotaExhausted, key_id
+from .gemini_transport import create_transport, GEMINI_TRANSPORT
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +19,9 @@ def get_api_keys():
     """Get all available API keys from environment variables"""
     primary_key = os.getenv("GEMINI_API_KEY")
     if not primary_key:
+        if GEMINI_TRANSPORT == "replay":
+            # Replays never reach the API; one placeholder key sizes the worker pool
+            return ["replay"]
         raise ValueError("GEMINI_API_KEY not found in environment variables")
     
     # Check for additional keys (GEMINI_API_KEY_1, GEMINI_API_KEY_2, etc.)
@@ -28,18 +36,83 @@ def get_api_keys():
     return all_keys
 
 API_KEYS = get_api_keys()
-CURRENT_KEY_INDEX = 0
+KEY_IDS = [key_id(key) for key in API_KEYS]
 
-def get_next_api_key():
-    """Rotate to the next available API key"""
-    global CURRENT_KEY_INDEX
-    CURRENT_KEY_INDEX = (CURRENT_KEY_INDEX + 1) % len(API_KEYS)
-    return API_KEYS[CURRENT_KEY_INDEX]
+# Per-key usage shared with the other worker processes on this host
+QUOTA_LEDGER = QuotaLedger()
 
-# Set initial API key
-genai.configure(api_key=API_KEYS[CURRENT_KEY_INDEX])
+# One API client per key. genai.configure() is process-global and read when a
+# request is sent, so with several worker threads it could send a request with
+# a different key than the ledger granted. Instead each call carries the client
+# of its key, set for the worker thread making the call.
+_key_clients = {}
+_key_clients_lock = threading.Lock()
+_call_local = threading.local()
+
+def get_key_client(index):
+    """The Gemini API client authenticated with the API key at the given index"""
+    with _key_clients_lock:
+        client = _key_clients.get(index)
+        if client is None:
+            client = glm.GenerativeServiceClient(client_options={"api_key": API_KEYS[index]})
+            _key_clients[index] = client
+        return client
+
+# Counters of Gemini usage in this process, read by progress reports
+GEMINI_STATS = {"calls": 0, "rate_limited": 0, "fallbacks": 0, "parsed": 0, "parse_failures": 0}
+_stats_lock = threading.Lock()
+
+def record_stat(name, amount=1):
+    with _stats_lock:
+        GEMINI_STATS[name] += amount
+
+def gemini_stats():
+    """Copy of GEMINI_STATS with the share of structured answers that failed to parse"""
+    with _stats_lock:
+        result = dict(GEMINI_STATS)
+    checked = result["parsed"] + result["parse_failures"]
+    result["parse_failure_rate"] = round(result["parse_failures"] / checked, 4) if checked else None
+    return result
+
+# Per-tier classification metrics: requests, escalations to the next tier,
+# escalations that could not be served (the tier's own verdict was kept),
+# summed latency and token usage (the cost driver). Calls made without the
+# cascade are counted as "single".
+CLASSIFICATION_TIERS = ["single", "fast", "strong"]
+TIER_STATS = {
+    tier: {"calls": 0, "escalations": 0, "escalations_unserved": 0, "latency_seconds": 0.0,
+           "prompt_tokens": 0, "output_tokens": 0}
+    for tier in CLASSIFICATION_TIERS
+}
+
+def record_tier(tier, latency=None, response=None, escalated=False, unserved=False):
+    usage = getattr(response, "usage_metadata", None)
+    with _stats_lock:
+        stats = TIER_STATS[tier]
+        if escalated:
+            stats["escalations"] += 1
+        if unserved:
+            stats["escalations_unserved"] += 1
+        if latency is not None:
+            stats["calls"] += 1
+            stats["latency_seconds"] += latency
+        if usage is not None:
+            stats["prompt_tokens"] += getattr(usage, "prompt_token_count", None) or 0
+            stats["output_tokens"] += getattr(usage, "candidates_token_count", None) or 0
+
+def tier_stats():
+    """Copy of TIER_STATS with average latency and escalation rate per tier"""
+    with _stats_lock:
+        result = {tier: dict(stats) for tier, stats in TIER_STATS.items()}
+    for stats in result.values():
+        calls = stats["calls"]
+        stats["avg_latency_seconds"] = round(stats["latency_seconds"] / calls, 3) if calls else None
+        stats["escalation_rate"] = round(stats["escalations"] / calls, 3) if calls else None
+    return result
 
 # Initialize Gemini model
+GEMINI_MODEL = "gemini-2.0-flash"
+
 generation_config = {
     "temperature": 0.2,
     "top_p": 0.95,
@@ -55,16 +128,213 @@ safety_settings = [
     {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
 ]
 
-def get_model():
-    """Get a model instance with the current API key"""
-    return genai.GenerativeModel(
-        model_name="gemini-2.0-flash",
-        generation_config=generation_config,
+# Structured output mode: the model must answer with JSON matching a schema,
+# with a tighter output budget and a short explanation
+STRUCTURED_OUTPUT = os.getenv("GEMINI_STRUCTURED_OUTPUT", "True").lower() == "true"
+CLASSIFY_MAX_OUTPUT_TOKENS = int(os.getenv("GEMINI_CLASSIFY_MAX_OUTPUT_TOKENS", "512"))
+EXPLANATION_MAX_CHARS = int(os.getenv("GEMINI_EXPLANATION_MAX_CHARS", "800"))
+# The combined verdict and analysis answer needs room for the five sections;
+# each section is asked to stay under ANALYSIS_SECTION_MAX_CHARS
+COMBINED_MAX_OUTPUT_TOKENS = int(os.getenv("GEMINI_COMBINED_MAX_OUTPUT_TOKENS", "4096"))
+ANALYSIS_SECTION_MAX_CHARS = int(os.getenv("GEMINI_ANALYSIS_SECTION_MAX_CHARS", "600"))
+
+CLASSIFICATION_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "is_fake": {"type": "BOOLEAN"},
+        "confidence": {"type": "NUMBER"},
+        "explanation": {"type": "STRING"}
+    },
+    "required": ["is_fake", "confidence", "explanation"]
+}
+
+# Sections of the detailed analysis, in the order of the /api/analyze prompt
+ANALYSIS_SECTIONS = [
+    "factual_accuracy",
+    "source_credibility",
+    "language_analysis",
+    "context_analysis",
+    "overall_assessment"
+]
+
+COMBINED_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        **CLASSIFICATION_SCHEMA["properties"],
+        "analysis": {
+            "type": "OBJECT",
+            "properties": {section: {"type": "STRING"} for section in ANALYSIS_SECTIONS},
+            "required": ANALYSIS_SECTIONS
+        }
+    },
+    "required": CLASSIFICATION_SCHEMA["required"] + ["analysis"]
+}
+
+classification_config = {
+    **generation_config,
+    "max_output_tokens": CLASSIFY_MAX_OUTPUT_TOKENS,
+    "response_mime_type": "application/json",
+    "response_schema": CLASSIFICATION_SCHEMA
+}
+
+# Model cascade: a fast tier with a short answer classifies first, and only
+# verdicts in the uncertain confidence band (or unreadable answers) are sent
+# to the strong tier with the full explanation prompt
+CASCADE_ENABLED = os.getenv("GEMINI_CASCADE", "False").lower() == "true"
+CASCADE_FAST_MODEL = os.getenv("GEMINI_CASCADE_FAST_MODEL", "gemini-2.0-flash-lite")
+CASCADE_STRONG_MODEL = os.getenv("GEMINI_CASCADE_STRONG_MODEL", GEMINI_MODEL)
+CASCADE_UNCERTAIN_LOW = float(os.getenv("GEMINI_CASCADE_UNCERTAIN_LOW", "0.4"))
+CASCADE_UNCERTAIN_HIGH = float(os.getenv("GEMINI_CASCADE_UNCERTAIN_HIGH", "0.6"))
+CASCADE_FAST_MAX_OUTPUT_TOKENS = int(os.getenv("GEMINI_CASCADE_FAST_MAX_OUTPUT_TOKENS", "128"))
+CASCADE_FAST_EXPLANATION_CHARS = int(os.getenv("GEMINI_CASCADE_FAST_EXPLANATION_CHARS", "200"))
+
+fast_classification_config = {
+    **classification_config,
+    "max_output_tokens": CASCADE_FAST_MAX_OUTPUT_TOKENS
+}
+
+combined_config = {
+    **generation_config,
+    "max_output_tokens": COMBINED_MAX_OUTPUT_TOKENS,
+    "response_mime_type": "application/json",
+    "response_schema": COMBINED_SCHEMA
+}
+
+def get_model(config=None, model_name=GEMINI_MODEL, client=None):
+    """Get a model instance that sends its requests with the given API client"""
+    model = genai.GenerativeModel(
+        model_name=model_name,
+        generation_config=config or generation_config,
         safety_settings=safety_settings
     )
+    if client is not None:
+        # GenerativeModel takes no client argument; without one it would use
+        # the process-global default client
+        model._client = client
+    return model
+
+def _send_live(model_name, config, prompt):
+    client = getattr(_call_local, "client", None)
+    if client is None:
+        raise RuntimeError("Live Gemini calls must run through call_gemini, which assigns an API key")
+    return get_model(config, model_name, client).generate_content(prompt)
+
+# Live API, or recording to / replaying from a cassette (GEMINI_TRANSPORT)
+TRANSPORT = create_transport(_send_live)
+
+def generate(prompt, config=None, model_name=GEMINI_MODEL):
+    """Send a prompt through the configured transport and return the response"""
+    return TRANSPORT.generate(model_name, config or generation_config, prompt)
+
+class ClassificationParseError(ValueError):
+    """Raised when a structured classification response does not match the schema"""
+
+def _load_json_object(response_text):
+    try:
+        result = json.loads(response_text)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ClassificationParseError(f"Response is not valid JSON: {e}")
+    if not isinstance(result, dict):
+        raise ClassificationParseError("Response is not a JSON object")
+    return result
+
+def _validate_classification(result):
+    is_fake = result.get("is_fake")
+    confidence = result.get("confidence")
+    explanation = result.get("explanation")
+    if not isinstance(is_fake, bool):
+        raise ClassificationParseError("is_fake must be a boolean")
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0.0 <= confidence <= 1.0:
+        raise ClassificationParseError("confidence must be a number between 0.0 and 1.0")
+    if not isinstance(explanation, str) or not explanation.strip():
+        raise ClassificationParseError("explanation must be a non-empty string")
+    
+    explanation = explanation.strip()
+    if len(explanation) > EXPLANATION_MAX_CHARS:
+        explanation = explanation[:EXPLANATION_MAX_CHARS].rsplit(" ", 1)[0] + "..."
+    return is_fake, float(confidence), explanation
+
+def parse_classification(response_text):
+    """
+    Strictly parse a structured classification response.
+
+    Returns (is_fake, confidence, explanation) or raises ClassificationParseError.
+    """
+    return _validate_classification(_load_json_object(response_text))
+
+class AnalysisParseError(ClassificationParseError):
+    """Raised when the verdict of a combined response is valid but its analysis is not"""
+
+    def __init__(self, message, classification):
+        super().__init__(message)
+        self.classification = classification
+
+def parse_classification_with_analysis(response_text):
+    """
+    Strictly parse a combined classification and analysis response.
+
+    Returns (is_fake, confidence, explanation, analysis) where analysis maps
+    each of ANALYSIS_SECTIONS to its text, or raises ClassificationParseError.
+    When only the analysis is missing or invalid, for example because the
+    answer was cut off at the output cap, AnalysisParseError carries the
+    valid (is_fake, confidence, explanation).
+    """
+    try:
+        result = _load_json_object(response_text)
+    except ClassificationParseError as e:
+        classification = _salvage_classification(response_text)
+        if classification is None:
+            raise
+        raise AnalysisParseError(str(e), classification)
+    is_fake, confidence, explanation = _validate_classification(result)
+    
+    analysis = result.get("analysis")
+    if not isinstance(analysis, dict):
+        raise AnalysisParseError("analysis must be an object", (is_fake, confidence, explanation))
+    for section in ANALYSIS_SECTIONS:
+        if not isinstance(analysis.get(section), str) or not analysis[section].strip():
+            raise AnalysisParseError(f"analysis.{section} must be a non-empty string", (is_fake, confidence, explanation))
+    return is_fake, confidence, explanation, {section: analysis[section].strip() for section in ANALYSIS_SECTIONS}
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _salvage_classification(response_text):
+    """
+    Verdict of a combined answer cut off inside its analysis. The members are
+    decoded one by one up to the top-level "analysis" key, so the same text
+    quoted inside the explanation is never mistaken for it.
+    """
+    if not isinstance(response_text, str):
+        return None
+    text = response_text.strip()
+    if not text.startswith("{"):
+        return None
+    fields = {}
+    pos = 1
+    try:
+        while True:
+            key, pos = _JSON_DECODER.raw_decode(text, _skip_space(text, pos))
+            pos = _skip_space(text, pos)
+            if not isinstance(key, str) or text[pos:pos + 1] != ":":
+                return None
+            if key == "analysis":
+                break
+            fields[key], pos = _JSON_DECODER.raw_decode(text, _skip_space(text, pos + 1))
+            pos = _skip_space(text, pos)
+            if text[pos:pos + 1] != ",":
+                return None
+            pos += 1
+        return _validate_classification(fields)
+    except (json.JSONDecodeError, ClassificationParseError):
+        return None
+
+def _skip_space(text, pos):
+    while pos < len(text) and text[pos] in " \t\r\n":
+        pos += 1
+    return pos
 
 # Fallback mechanism when rate limit is exceeded
-def get_fallback_classification(title, content):
+def get_fallback_classification(title, content, reason="API rate limits"):
     """
     Provide a simple rule-based classification when AI is unavailable
     """
@@ -88,7 +358,7 @@ def get_fallback_classification(title, content):
         is_fake = True
         confidence = min(0.5 + (count * 0.05), 0.95)  # Cap at 0.95
         explanation = (
-            "Due to API rate limits, we're using a simplified analysis method. "
+            f"Due to {reason}, we're using a simplified analysis method. "
             f"This content contains {count} phrases often associated with misleading content. "
             "This is not a definitive classification and you should verify with other sources."
         )
@@ -96,7 +366,7 @@ def get_fallback_classification(title, content):
         is_fake = False
         confidence = max(0.5 - (count * 0.05), 0.05)  # Floor at 0.05
         explanation = (
-            "Due to API rate limits, we're using a simplified analysis method. "
+            f"Due to {reason}, we're using a simplified analysis method. "
             f"This content contains {count} phrases that might indicate misleading content. "
             "The content appears relatively neutral, but this is not a definitive classification "
             "and you should verify with other sources."
@@ -104,55 +374,117 @@ def get_fallback_classification(title, content):
     
     return is_fake, confidence, explanation
 
-async def classify_news(title, content):
+def is_rate_limit_error(error):
+    """Check whether an exception from the Gemini API is a rate limit error"""
+    error_str = str(error).lower()
+    return "429" in error_str or "quota" in error_str or "rate limit" in error_str
+
+def _call_with_key(func, *args):
+    """Reserve a key in the shared ledger and make a blocking Gemini call with it"""
+    if not TRANSPORT.uses_api_keys:
+        # Replayed responses do not consume key quota
+        record_stat("calls")
+        return func(*args)
+    key_index = QUOTA_LEDGER.acquire(KEY_IDS)
+    _call_local.client = get_key_client(key_index)
+    record_stat("calls")
+    try:
+        return func(*args)
+    except Exception as e:
+        if is_rate_limit_error(e):
+            record_stat("rate_limited")
+            print(f"Rate limit exceeded on key {key_index + 1}/{len(API_KEYS)}. Error: {e}")
+            # Tell every worker on this host to stop using the key for a while
+            QUOTA_LEDGER.cooldown(KEY_IDS[key_index])
+        raise
+    finally:
+        _call_local.client = None
+
+async def call_gemini(func, *args):
     """
-    Classify news as fake or real using Gemini AI
-    
-    Returns:
-    - is_fake: boolean
-    - confidence: float (0.0 to 1.0)
-    - explanation: string
+    Run a blocking Gemini call in the Gemini thread pool.
+
+    Keys are chosen through the shared quota ledger. A call that hits a rate
+    limit is retried on another key, up to 3 attempts. Raises QuotaExhausted
+    when no key can serve the request.
     """
-    # If we have more than one API key, try each key before falling back
-    original_key_index = CURRENT_KEY_INDEX
     retry_attempts = min(len(API_KEYS), 3)  # Try up to 3 keys
-    
+    executor = get_gemini_executor(len(API_KEYS))
+
     for attempt in range(retry_attempts):
-        # Run this in a separate thread to not block asyncio
-        loop = asyncio.get_event_loop()
         try:
-            if attempt > 0:
-                next_key = get_next_api_key()
-                genai.configure(api_key=next_key)
-                print(f"Trying with alternate API key {CURRENT_KEY_INDEX + 1}/{len(API_KEYS)}")
-                
-            result = await loop.run_in_executor(None, _classify_news_sync, title, content)
-            return result
+            # Run this in the Gemini thread pool to not block asyncio
+            return await executor.run(_call_with_key, func, *args)
+        except QuotaExhausted:
+            raise
         except Exception as e:
-            # Check if it's a rate limit error
-            error_str = str(e).lower()
-            if "429" in error_str or "quota" in error_str or "rate limit" in error_str:
-                print(f"Rate limit exceeded on key {CURRENT_KEY_INDEX + 1}/{len(API_KEYS)}. Error: {e}")
-                
-                # If we've tried all keys, use fallback
-                if attempt == retry_attempts - 1:
-                    print("All API keys reached rate limits. Using fallback classification.")
-                    # Add random delay before returning to reduce concurrent requests
-                    await asyncio.sleep(random.uniform(1, 3))
-                    return get_fallback_classification(title, content)
-                
-                # Otherwise try next key, with slight delay
-                await asyncio.sleep(1)
-            else:
+            if not is_rate_limit_error(e):
                 # Re-raise other errors
                 raise
+            if attempt == retry_attempts - 1:
+                raise QuotaExhausted(QUOTA_LEDGER.cooldown_seconds)
+            # Otherwise try another key, with slight delay
+            await asyncio.sleep(1)
+
+def gemini_admission(priority, client):
+    """
+    Hold a Gemini slot for a request of the given priority class and client.
+
+    Raises AdmissionRejected when that class has no room left to queue.
+    """
+    return get_gemini_admission(len(API_KEYS)).admit(priority, client)
+
+async def classify_news(title, content, allow_fallback=True):
+    """
+    Classify news as fake or real using Gemini AI
     
-    # This should not be reached, but just in case
-    return get_fallback_classification(title, content)
+    Returns:
+    - is_fake: boolean
+    - confidence: float (0.0 to 1.0)
+    - explanation: string
+    
+    With GEMINI_CASCADE enabled the fast tier answers first and uncertain
+    verdicts are escalated to the strong tier.
+    
+    When every API key is rate limited the keyword fallback is used, unless
+    allow_fallback is False, in which case QuotaExhausted is raised.
+    """
+    try:
+        if CASCADE_ENABLED:
+            return await _classify_with_cascade(title, content)
+        return await call_gemini(_classify_news_sync, title, content)
+    except QuotaExhausted:
+        if not allow_fallback:
+            raise
+        record_stat("fallbacks")
+        print("All API keys reached rate limits. Using fallback classification.")
+        return get_fallback_classification(title, content)
 
-def _classify_news_sync(title, content):
-    # Construct prompt for Gemini
-    prompt = f"""Analyze the following news article for factual accuracy and determine if it's fake news.
+CONFIDENCE_SCALE = """For the confidence score:
+- 0.0-0.2: Highly confident it's real news
+- 0.2-0.4: Somewhat confident it's real news
+- 0.4-0.6: Uncertain
+- 0.6-0.8: Somewhat confident it's fake news
+- 0.8-1.0: Highly confident it's fake news
+
+Focus on analyzing language patterns, source credibility, consistency with known facts, logical coherence, and emotional manipulation tactics.
+"""
+
+def classification_prompt(title, content, structured=STRUCTURED_OUTPUT, explanation_chars=EXPLANATION_MAX_CHARS):
+    """Build the classification prompt for the structured or free-form JSON mode"""
+    if structured:
+        # The response schema fixes the output shape, so only the semantics are described
+        return f"""Analyze the following news article for factual accuracy and determine if it's fake news.
+
+Title: {title}
+
+Content: {content}
+
+Set is_fake, a confidence score from 0.0 to 1.0, and an explanation of at most {explanation_chars} characters giving the main reasons for the verdict.
+
+{CONFIDENCE_SCALE}"""
+
+    return f"""Analyze the following news article for factual accuracy and determine if it's fake news.
     
 Title: {title}
 
@@ -165,102 +497,190 @@ Please provide a JSON response with the following structure:
     "explanation": "detailed explanation of why this is considered fake or real news"
 }}
 
-For the confidence score:
-- 0.0-0.2: Highly confident it's real news
-- 0.2-0.4: Somewhat confident it's real news
-- 0.4-0.6: Uncertain
-- 0.6-0.8: Somewhat confident it's fake news
-- 0.8-1.0: Highly confident it's fake news
+{CONFIDENCE_SCALE}"""
 
-Focus on analyzing language patterns, source credibility, consistency with known facts, logical coherence, and emotional manipulation tactics.
-"""
+def generate_classification(title, content, structured=STRUCTURED_OUTPUT, tier="single"):
+    """Send the classification prompt of a cascade tier (or the single model) to Gemini and return the raw response"""
+    if tier == "fast":
+        prompt = classification_prompt(title, content, True, CASCADE_FAST_EXPLANATION_CHARS)
+        config, model_name = fast_classification_config, CASCADE_FAST_MODEL
+    else:
+        prompt = classification_prompt(title, content, structured)
+        config = classification_config if structured else None
+        model_name = CASCADE_STRONG_MODEL if tier == "strong" else GEMINI_MODEL
     
+    started = time.perf_counter()
+    response = generate(prompt, config, model_name)
+    record_tier(tier, time.perf_counter() - started, response)
+    return response
+
+def _parse_free_form_classification(response_text):
+    # Extract JSON from response
     try:
-        # Get response from Gemini
-        model = get_model()
-        response = model.generate_content(prompt)
-        response_text = response.text
-        
-        # Extract JSON from response
-        try:
-            # Check if response is wrapped in code blocks
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].strip()
-            else:
-                json_str = response_text.strip()
-                
-            result = json.loads(json_str)
-            return result["is_fake"], result["confidence"], result["explanation"]
-        except (KeyError, json.JSONDecodeError) as e:
-            # Fallback to manual parsing if JSON parsing fails
-            is_fake = "true" in response_text.lower() and "is_fake" in response_text.lower()
-            confidence = 0.7 if is_fake else 0.3  # Default confidence
-            explanation = response_text
-            return is_fake, confidence, explanation
+        # Check if response is wrapped in code blocks
+        if "```json" in response_text:
+            json_str = response_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in response_text:
+            json_str = response_text.split("```")[1].strip()
+        else:
+            json_str = response_text.strip()
+            
+        result = json.loads(json_str)
+        return result["is_fake"], result["confidence"], result["explanation"]
+    except (KeyError, json.JSONDecodeError) as e:
+        # Fallback to manual parsing if JSON parsing fails
+        is_fake = "true" in response_text.lower() and "is_fake" in response_text.lower()
+        confidence = 0.7 if is_fake else 0.3  # Default confidence
+        explanation = response_text
+        return is_fake, confidence, explanation
+
+def _classify_news_sync(title, content, structured=STRUCTURED_OUTPUT):
+    # Get response from Gemini
+    response = generate_classification(title, content, structured)
+    response_text = response.text
+    
+    if not structured:
+        return _parse_free_form_classification(response_text)
+    
+    try:
+        result = parse_classification(response_text)
+        record_stat("parsed")
+        return result
+    except ClassificationParseError as e:
+        # Do not guess a verdict from malformed output
+        record_stat("parse_failures")
+        print(f"Could not parse structured classification: {e}")
+        return get_fallback_classification(title, content, reason="an unreadable AI response")
+
+def _classify_fast_sync(title, content):
+    """Fast cascade tier: a verdict, or None when the answer is unreadable"""
+    response = generate_classification(title, content, True, tier="fast")
+    try:
+        return parse_classification(response.text)
+    except ValueError as e:
+        # Includes ClassificationParseError and responses without text
+        print(f"Fast tier answer could not be parsed, escalating: {e}")
+        return None
+
+def _classify_strong_sync(title, content):
+    """Strong cascade tier: a verdict, or ClassificationParseError when the answer is unreadable"""
+    response = generate_classification(title, content, True, tier="strong")
+    try:
+        result = parse_classification(response.text)
+    except ValueError as e:
+        # Includes responses without text
+        record_stat("parse_failures")
+        raise ClassificationParseError(f"Strong tier answer could not be parsed: {e}")
+    record_stat("parsed")
+    return result
+
+def needs_escalation(result):
+    """Whether a fast tier result must be checked by the strong tier"""
+    return result is None or CASCADE_UNCERTAIN_LOW <= result[1] <= CASCADE_UNCERTAIN_HIGH
+
+async def _classify_with_cascade(title, content):
+    result = await call_gemini(_classify_fast_sync, title, content)
+    if not needs_escalation(result):
+        return result
+    record_tier("fast", escalated=True)
+    try:
+        return await call_gemini(_classify_strong_sync, title, content)
     except Exception as e:
-        # Let the calling function handle this
+        if result is not None:
+            # No capacity, an API error or an unreadable answer: an uncertain
+            # model verdict still beats the keyword heuristic
+            record_tier("fast", unserved=True)
+            print(f"Strong tier failed, keeping the fast tier verdict: {e}")
+            return result
+        if isinstance(e, ClassificationParseError):
+            return get_fallback_classification(title, content, reason="an unreadable AI response")
         raise
 
-async def analyze_news_content(text):
+async def classify_and_analyze_news(title, content, allow_fallback=True):
     """
-    Perform detailed analysis of news content
+    Classify news and produce the detailed analysis in a single Gemini call
     
     Returns:
-    - analysis: string with detailed analysis
+    - is_fake: boolean
+    - confidence: float (0.0 to 1.0)
+    - explanation: string
+    - analysis: dict of ANALYSIS_SECTIONS to text, or None when unavailable
     """
-    # If we have more than one API key, try each key before falling back
-    original_key_index = CURRENT_KEY_INDEX
-    retry_attempts = min(len(API_KEYS), 3)  # Try up to 3 keys
+    try:
+        return await call_gemini(_classify_and_analyze_news_sync, title, content)
+    except QuotaExhausted:
+        if not allow_fallback:
+            raise
+        record_stat("fallbacks")
+        print("All API keys reached rate limits. Using fallback classification.")
+        return (*get_fallback_classification(title, content), None)
+
+def _classify_and_analyze_news_sync(title, content):
+    prompt = f"""Analyze the following news article for factual accuracy and determine if it's fake news.
+
+Title: {title}
+
+Content: {content}
+
+Set is_fake, a confidence score from 0.0 to 1.0, and an explanation of at most {EXPLANATION_MAX_CHARS} characters giving the main reasons for the verdict.
+
+Also provide a detailed analysis with these sections, each at most {ANALYSIS_SECTION_MAX_CHARS} characters:
+- factual_accuracy: identify any false or misleading claims
+- source_credibility: source credibility assessment
+- language_analysis: identify emotional manipulation, propaganda techniques
+- context_analysis: is important context missing?
+- overall_assessment: overall assessment of reliability
+
+Please be specific and cite brief examples from the text.
+
+{CONFIDENCE_SCALE}"""
     
-    for attempt in range(retry_attempts):
-        loop = asyncio.get_event_loop()
-        try:
-            if attempt > 0:
-                next_key = get_next_api_key()
-                genai.configure(api_key=next_key)
-                print(f"Trying with alternate API key {CURRENT_KEY_INDEX + 1}/{len(API_KEYS)}")
-                
-            result = await loop.run_in_executor(None, _analyze_news_content_sync, text)
-            return result
-        except Exception as e:
-            # Check if it's a rate limit error
-            error_str = str(e).lower()
-            if "429" in error_str or "quota" in error_str or "rate limit" in error_str:
-                print(f"Rate limit exceeded on key {CURRENT_KEY_INDEX + 1}/{len(API_KEYS)}. Error: {e}")
-                
-                # If we've tried all keys, use fallback
-                if attempt == retry_attempts - 1:
-                    print("All API keys reached rate limits. Using fallback analysis.")
-                    # Add random delay before returning to reduce concurrent requests
-                    await asyncio.sleep(random.uniform(1, 3))
-                    return (
-                        "Unable to perform detailed analysis due to API rate limits. "
-                        "Please try again later or verify this content with other fact-checking sources. "
-                        "When analyzing news, look for these indicators of potential fake news:\n\n"
-                        "1. Sensationalist language and clickbait headlines\n"
-                        "2. Lack of cited sources or references to anonymous sources\n"
-                        "3. Emotional manipulation and fear-mongering\n"
-                        "4. Missing context or incomplete information\n"
-                        "5. Non-reputable or unfamiliar publication source\n"
-                        "6. Poor grammar, spelling errors, or excessive use of ALL CAPS\n"
-                        "7. Claims that seem too shocking or unlikely to be true\n"
-                        "8. Recently created website with no history\n\n"
-                        "Always cross-check information across multiple reliable sources."
-                    )
-                
-                # Otherwise try next key, with slight delay
-                await asyncio.sleep(1)
-            else:
-                # Re-raise other errors
-                raise
+    response = generate(prompt, combined_config)
     
-    # This should not be reached, but just in case
-    return (
-        "Unable to perform detailed analysis due to API rate limits. "
-        "Please try again later or verify this content with other fact-checking sources."
-    )
+    try:
+        result = parse_classification_with_analysis(response.text)
+        record_stat("parsed")
+        return result
+    except AnalysisParseError as e:
+        # Keep the valid verdict; only the analysis is unavailable
+        record_stat("parse_failures")
+        print(f"Could not parse the analysis of a combined classification: {e}")
+        return (*e.classification, None)
+    except ClassificationParseError as e:
+        record_stat("parse_failures")
+        print(f"Could not parse combined classification: {e}")
+        return (*get_fallback_classification(title, content, reason="an unreadable AI response"), None)
+
+async def analyze_news_content(text, allow_fallback=True):
+    """
+    Perform detailed analysis of news content
+    
+    Returns:
+    - analysis: string with detailed analysis
+    
+    When every API key is rate limited a generic checklist is returned, unless
+    allow_fallback is False, in which case QuotaExhausted is raised.
+    """
+    try:
+        return await call_gemini(_analyze_news_content_sync, text)
+    except QuotaExhausted:
+        if not allow_fallback:
+            raise
+        print("All API keys reached rate limits. Using fallback analysis.")
+        return (
+            "Unable to perform detailed analysis due to API rate limits. "
+            "Please try again later or verify this content with other fact-checking sources. "
+            "When analyzing news, look for these indicators of potential fake news:\n\n"
+            "1. Sensationalist language and clickbait headlines\n"
+            "2. Lack of cited sources or references to anonymous sources\n"
+            "3. Emotional manipulation and fear-mongering\n"
+            "4. Missing context or incomplete information\n"
+            "5. Non-reputable or unfamiliar publication source\n"
+            "6. Poor grammar, spelling errors, or excessive use of ALL CAPS\n"
+            "7. Claims that seem too shocking or unlikely to be true\n"
+            "8. Recently created website with no history\n\n"
+            "Always cross-check information across multiple reliable sources."
+        )
 
 def _analyze_news_content_sync(text):
     # Construct prompt for Gemini
@@ -279,6 +699,5 @@ Please be specific and cite examples from the text.
 """
     
     # Get response from Gemini
-    model = get_model()
-    response = model.generate_content(prompt)
+    response = generate(prompt)
     return response.text
\ No newline at end of file
@@ -0,0 +1,183 @@
+import os
+import json
+import gzip
+import time
+import atexit
+import hashlib
+import threading
+from types import SimpleNamespace
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# How Gemini requests are served:
+# - live: call the API
+# - record: call the API and append every prompt, response and latency to the cassette
+# - replay: answer from the cassette without network access or API keys
+GEMINI_TRANSPORT = os.getenv("GEMINI_TRANSPORT", "live").lower()
+GEMINI_CASSETTE = os.getenv("GEMINI_CASSETTE", "gemini_cassette.jsonl.gz")
+# Replayed responses wait their recorded latency times this factor (0 answers at once)
+GEMINI_REPLAY_LATENCY = float(os.getenv("GEMINI_REPLAY_LATENCY", "0"))
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a request that was never recorded"""
+
+
+class ReplayedError(Exception):
+    """An error recorded from the live API, raised again on replay"""
+
+
+def request_key(model_name, config, prompt):
+    """Identity of a request: the same model, generation settings and prompt"""
+    payload = json.dumps([model_name, config, prompt], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LiveTransport:
+    """Send requests to the Gemini API with send(model_name, config, prompt)"""
+
+    uses_api_keys = True
+
+    def __init__(self, send):
+        self._send = send
+
+    def generate(self, model_name, config, prompt):
+        return self._send(model_name, config, prompt)
+
+    def close(self):
+        pass
+
+
+class RecordingTransport(LiveTransport):
+    """
+    Live transport that appends each exchange to a gzipped NDJSON cassette.
+
+    Rate limit and other API errors are recorded too, so replays reproduce
+    them. Record from a single process: the cassette is not shared safely
+    between writers.
+    """
+
+    def __init__(self, send, path):
+        super().__init__(send)
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        atexit.register(self.close)
+
+    def generate(self, model_name, config, prompt):
+        record = {"key": request_key(model_name, config, prompt), "model": model_name, "prompt": prompt}
+        started = time.perf_counter()
+        try:
+            response = self._send(model_name, config, prompt)
+        except Exception as e:
+            record.update(latency_ms=round((time.perf_counter() - started) * 1000, 1), error=str(e))
+            self._append(record)
+            raise
+        record["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        try:
+            record["text"] = response.text
+        except ValueError as e:
+            # e.g. a response blocked by safety settings has no text
+            record["text_error"] = str(e)
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            record["prompt_tokens"] = getattr(usage, "prompt_token_count", None)
+            record["output_tokens"] = getattr(usage, "candidates_token_count", None)
+        self._append(record)
+        return response
+
+    def _append(self, record):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(record) + "\n")
+            # Sync-flush so a crash loses at most the record being written
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class ReplayedResponse:
+    """The parts of a Gemini response the services read: text and usage_metadata"""
+
+    def __init__(self, record):
+        self._record = record
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=record.get("prompt_tokens"),
+            candidates_token_count=record.get("output_tokens")
+        )
+
+    @property
+    def text(self):
+        if "text_error" in self._record:
+            raise ValueError(self._record["text_error"])
+        return self._record["text"]
+
+
+class ReplayTransport:
+    """
+    Serve recorded responses. A request recorded several times cycles through
+    its recordings, so replays keep the variance of the live responses.
+    """
+
+    uses_api_keys = False
+
+    def __init__(self, path, latency_scale=GEMINI_REPLAY_LATENCY):
+        self.path = path
+        self.latency_scale = latency_scale
+        self._records = {}
+        self._next = {}
+        self._lock = threading.Lock()
+        for record in load_cassette(path):
+            self._records.setdefault(record["key"], []).append(record)
+        print(f"Replaying {sum(len(r) for r in self._records.values())} Gemini responses from {path}")
+
+    def generate(self, model_name, config, prompt):
+        key = request_key(model_name, config, prompt)
+        recordings = self._records.get(key)
+        if not recordings:
+            raise CassetteMiss(f"No recorded {model_name} response for this request in {self.path}")
+        with self._lock:
+            index = self._next.get(key, 0)
+            self._next[key] = index + 1
+        record = recordings[index % len(recordings)]
+
+        if self.latency_scale:
+            time.sleep(record.get("latency_ms", 0) / 1000 * self.latency_scale)
+        if "error" in record:
+            raise ReplayedError(record["error"])
+        return ReplayedResponse(record)
+
+    def close(self):
+        pass
+
+
+def load_cassette(path):
+    """Read every record of a cassette, tolerating a final record cut off by a crash"""
+    records = []
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                if line.strip():
+                    records.append(json.loads(line))
+        except (EOFError, json.JSONDecodeError):
+            pass
+    return records
+
+
+def create_transport(send):
+    """Transport for GEMINI_TRANSPORT; send(model_name, config, prompt) calls the live API"""
+    if GEMINI_TRANSPORT == "live":
+        return LiveTransport(send)
+    if GEMINI_TRANSPORT == "record":
+        return RecordingTransport(send, GEMINI_CASSETTE)
+    if GEMINI_TRANSPORT == "replay":
+        return ReplayTransport(GEMINI_CASSETTE)
+    raise ValueError(f"Unknown GEMINI_TRANSPORT {GEMINI_TRANSPORT!r}; use live, record or replay")
@@ -0,0 +1,71 @@
+import os
+import asyncio
+from dotenv import load_dotenv
+from ..config.mongodb import ping, pool_monitor
+from ..utils.admission import get_gemini_admission
+from .gemini_service import QUOTA_LEDGER, KEY_IDS, gemini_stats, tier_stats
+
+# Load environment variables
+load_dotenv()
+
+# Readiness thresholds. An instance over any of them reports 503 on /readyz
+# so the load balancer routes around it until it recovers.
+READY_PING_TIMEOUT_SECONDS = float(os.getenv("READY_PING_TIMEOUT_SECONDS", "2"))
+READY_MAX_PING_MS = float(os.getenv("READY_MAX_PING_MS", "250"))
+READY_MAX_CHECKOUT_WAIT_MS = float(os.getenv("READY_MAX_CHECKOUT_WAIT_MS", "100"))
+
+
+async def check_mongodb():
+    try:
+        latency_ms = await asyncio.wait_for(ping(), timeout=READY_PING_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"ping timed out after {READY_PING_TIMEOUT_SECONDS}s"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": latency_ms <= READY_MAX_PING_MS, "ping_ms": round(latency_ms, 2)}
+
+
+def check_pool():
+    """Pool checkout wait since the previous probe (the maximum resets on each read)"""
+    pool = pool_monitor.snapshot(reset_max=True)
+    pool["ok"] = pool["avg_checkout_wait_ms"] <= READY_MAX_CHECKOUT_WAIT_MS
+    return pool
+
+
+def check_gemini():
+    """
+    Breaker state of the Gemini keys, from the shared quota ledger: closed
+    when every key is usable, half_open while some are cooling down after a
+    429, open when all of them are.
+
+    The state is reported but never fails readiness: the keys are shared by
+    every instance, so an open breaker would take all of them out of the
+    load balancer at once, including for endpoints that do not call Gemini.
+    /api/detect answers 429 with Retry-After while the breaker is open.
+    """
+    keys = QUOTA_LEDGER.snapshot(KEY_IDS)
+    cooling = sum(1 for key in keys if key["cooldown_remaining"] > 0)
+    if cooling == 0:
+        state = "closed"
+    elif cooling < len(keys):
+        state = "half_open"
+    else:
+        state = "open"
+    return {
+        "ok": True,
+        "state": state,
+        "keys": keys,
+        "admission": get_gemini_admission(len(KEY_IDS)).snapshot(),
+        "calls": gemini_stats(),
+        "tiers": tier_stats()
+    }
+
+
+async def check_readiness():
+    """Run every readiness check; returns (ready, checks)"""
+    checks = {
+        "mongodb": await check_mongodb(),
+        "pool": check_pool(),
+        "gemini": check_gemini()
+    }
+    return all(check["ok"] for check in checks.values()), checks
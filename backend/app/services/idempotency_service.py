@@ -0,0 +1,142 @@
+import os
+import json
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+import pytz
+from pymongo import ASCENDING
+from pymongo.errors import DuplicateKeyError
+from dotenv import load_dotenv
+from ..config.mongodb import idempotency_collection
+
+# Load environment variables
+load_dotenv()
+
+# Stored responses are kept for IDEMPOTENCY_TTL_SECONDS. A duplicate waits up
+# to IDEMPOTENCY_WAIT_SECONDS for the first request to finish, and a pending
+# record older than IDEMPOTENCY_PENDING_SECONDS is treated as abandoned.
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "60"))
+IDEMPOTENCY_PENDING_SECONDS = int(os.getenv("IDEMPOTENCY_PENDING_SECONDS", "300"))
+IDEMPOTENCY_POLL_SECONDS = 0.25
+
+PENDING = "pending"
+DONE = "done"
+
+# Requests running in this process, so local duplicates wait without polling
+_in_flight = {}
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when a key is sent again with a different request body"""
+
+
+class IdempotencyInProgress(Exception):
+    """Raised when the first request with a key is still running after the wait limit"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(f"A request with this Idempotency-Key is still in progress; retry in {retry_after}s")
+
+
+def request_fingerprint(*parts):
+    """Hash of the request payload, to tell a retry from a reused key"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+async def ensure_idempotency_indexes():
+    """Expire stored responses after the TTL"""
+    await idempotency_collection.create_index(
+        [("created_at", ASCENDING)],
+        expireAfterSeconds=IDEMPOTENCY_TTL_SECONDS
+    )
+
+
+async def run_idempotent(scope, key, fingerprint, func):
+    """
+    Run func() at most once per (scope, key) and return its JSON-serializable result.
+
+    The first request claims the key with a pending record. Concurrent and
+    later duplicates wait for it and get the stored result. If func raises,
+    the claim is released so a retry runs it again.
+    """
+    record_id = f"{scope}:{key}"
+    deadline = asyncio.get_event_loop().time() + IDEMPOTENCY_WAIT_SECONDS
+
+    while True:
+        now = datetime.now(pytz.UTC)
+        try:
+            await idempotency_collection.insert_one({
+                "_id": record_id,
+                "status": PENDING,
+                "fingerprint": fingerprint,
+                "created_at": now
+            })
+        except DuplicateKeyError:
+            record = await _wait_for_record(record_id, fingerprint, deadline)
+            if record is None:
+                continue  # the first request failed or was abandoned; claim the key
+            return record["response"]
+        return await _run_claimed(record_id, func)
+
+
+async def _run_claimed(record_id, func):
+    done = asyncio.Event()
+    _in_flight[record_id] = done
+    try:
+        response = await func()
+    except BaseException:
+        await idempotency_collection.delete_one({"_id": record_id, "status": PENDING})
+        raise
+    else:
+        await idempotency_collection.update_one(
+            {"_id": record_id},
+            {"$set": {"status": DONE, "response": response}}
+        )
+        return response
+    finally:
+        _in_flight.pop(record_id, None)
+        done.set()
+
+
+async def _wait_for_record(record_id, fingerprint, deadline):
+    """
+    Wait until the record is done and return it, or return None once it is
+    gone. Raises IdempotencyInProgress when the deadline passes first.
+    """
+    loop = asyncio.get_event_loop()
+    while True:
+        record = await idempotency_collection.find_one({"_id": record_id})
+        if record is None:
+            return None
+        if record["fingerprint"] != fingerprint:
+            raise IdempotencyKeyReused("This Idempotency-Key was already used with a different request")
+        if record["status"] == DONE:
+            return record
+
+        created_at = record["created_at"]
+        if not created_at.tzinfo:
+            created_at = created_at.replace(tzinfo=pytz.UTC)
+        if datetime.now(pytz.UTC) - created_at > timedelta(seconds=IDEMPOTENCY_PENDING_SECONDS):
+            # The process that claimed the key died; let this request take over
+            await idempotency_collection.delete_one({"_id": record_id, "status": PENDING, "created_at": record["created_at"]})
+            return None
+
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise IdempotencyInProgress(1)
+
+        local = _in_flight.get(record_id)
+        if local is not None:
+            try:
+                await asyncio.wait_for(local.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await asyncio.sleep(min(IDEMPOTENCY_POLL_SECONDS, remaining))
@@ -0,0 +1,170 @@
+import os
+import time
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Shared ledger settings. Every worker process on the host opens the same
+# SQLite file, so per-key limits apply to the host as a whole.
+QUOTA_DB_PATH = os.getenv(
+    "GEMINI_QUOTA_DB",
+    os.path.join(tempfile.gettempdir(), "fake_news_gemini_quota.sqlite3")
+)
+KEY_REQUESTS_PER_WINDOW = int(os.getenv("GEMINI_KEY_RPM", "15"))  # 0 disables the limit
+QUOTA_WINDOW_SECONDS = float(os.getenv("GEMINI_QUOTA_WINDOW", "60"))
+KEY_COOLDOWN_SECONDS = float(os.getenv("GEMINI_KEY_COOLDOWN", "60"))
+
+
+class QuotaExhausted(Exception):
+    """Raised when no API key has capacity left in the current window"""
+
+    def __init__(self, retry_after):
+        self.retry_after = max(1, int(retry_after + 0.999))
+        super().__init__(f"All API keys are rate limited. Retry after {self.retry_after}s")
+
+
+def key_id(api_key):
+    """Stable identifier for an API key that does not expose the key itself"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class QuotaLedger:
+    """
+    Per-key request counts and cooldowns shared by all processes on a host.
+
+    Counts use fixed windows of QUOTA_WINDOW_SECONDS. Each acquire runs in an
+    IMMEDIATE transaction so concurrent workers cannot both take the last slot.
+    """
+
+    def __init__(self, path=QUOTA_DB_PATH, limit=KEY_REQUESTS_PER_WINDOW,
+                 window=QUOTA_WINDOW_SECONDS, cooldown=KEY_COOLDOWN_SECONDS):
+        self.path = path
+        self.limit = limit
+        self.window = window
+        self.cooldown_seconds = cooldown
+        self._local = threading.local()
+        self._connection().execute("PRAGMA journal_mode=WAL")
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS key_usage (
+                    key_id TEXT PRIMARY KEY,
+                    window_start REAL NOT NULL DEFAULT 0,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    cooldown_until REAL NOT NULL DEFAULT 0
+                )"""
+            )
+
+    def _connection(self):
+        # sqlite3 connections cannot be shared across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _connect(self):
+        return _Transaction(self._connection())
+
+    def acquire(self, key_ids):
+        """
+        Reserve one request on the least used key that has capacity.
+
+        Returns the index of the chosen key in key_ids, or raises QuotaExhausted
+        with the number of seconds until a key frees up.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO key_usage (key_id) VALUES (?)",
+                [(k,) for k in key_ids]
+            )
+            rows = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    "SELECT key_id, window_start, count, cooldown_until FROM key_usage "
+                    f"WHERE key_id IN ({','.join('?' * len(key_ids))})",
+                    list(key_ids)
+                )
+            }
+
+            best_index = None
+            best_count = None
+            retry_after = self.window
+            for index, k in enumerate(key_ids):
+                window_start, count, cooldown_until = rows[k]
+                if cooldown_until > now:
+                    retry_after = min(retry_after, cooldown_until - now)
+                    continue
+                if now - window_start >= self.window:
+                    count = 0
+                if self.limit and count >= self.limit:
+                    retry_after = min(retry_after, window_start + self.window - now)
+                    continue
+                if best_count is None or count < best_count:
+                    best_index, best_count = index, count
+
+            if best_index is None:
+                raise QuotaExhausted(retry_after)
+
+            chosen = key_ids[best_index]
+            window_start = rows[chosen][0]
+            if now - window_start >= self.window:
+                conn.execute(
+                    "UPDATE key_usage SET window_start = ?, count = 1 WHERE key_id = ?",
+                    (now, chosen)
+                )
+            else:
+                conn.execute(
+                    "UPDATE key_usage SET count = count + 1 WHERE key_id = ?",
+                    (chosen,)
+                )
+            return best_index
+
+    def cooldown(self, key, seconds=None):
+        """Take a key out of rotation, e.g. after it returned a 429"""
+        until = time.time() + (self.cooldown_seconds if seconds is None else seconds)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO key_usage (key_id, cooldown_until) VALUES (?, ?) "
+                "ON CONFLICT(key_id) DO UPDATE SET cooldown_until = MAX(cooldown_until, excluded.cooldown_until)",
+                (key, until)
+            )
+
+    def snapshot(self, key_ids):
+        """Current usage for each key, in the order of key_ids"""
+        now = time.time()
+        with self._connect() as conn:
+            rows = {
+                row[0]: row[1:]
+                for row in conn.execute("SELECT key_id, window_start, count, cooldown_until FROM key_usage")
+            }
+        result = []
+        for k in key_ids:
+            window_start, count, cooldown_until = rows.get(k, (0, 0, 0))
+            result.append({
+                "key_id": k,
+                "requests_in_window": count if now - window_start < self.window else 0,
+                "limit": self.limit,
+                "cooldown_remaining": round(max(0.0, cooldown_until - now), 1)
+            })
+        return result
+
+
+class _Transaction:
+    """Context manager that holds the SQLite write lock for its whole body"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
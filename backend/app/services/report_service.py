@@ -6,125 +6,226 @@ import matplotlib.pyplot as plt
 import plotly.express as px
 import plotly.io as pio
 from datetime import datetime, timedelta
-import asyncio
 import pytz
-from ..models.report_models import NewsReport, StatCount, ConfidenceStats, ReportStatistics
-from ..config.mongodb import reports_collection
+from bson import ObjectId
+from pymongo import ASCENDING
+from ..models.report_models import NewsReport, StatCount, ConfidenceStats, QuantileStats, ReportStatistics
+from ..config.mongodb import reports_collection, archive_collection, metadata_collection
+from ..utils.executors import get_render_executor
+from .event_service import publish_report
+from .search_service import index_report
+from .retention_service import expand_archived_report
+from .body_service import content_hash, insert_reports, attach_bodies
+from .rollup_service import load_rollups
+from ..utils.sketches import QuantileSketch, HyperLogLog
 
 # Path to static directory for charts
 STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
 os.makedirs(STATIC_DIR, exist_ok=True)
 
-async def add_news_to_report(title, content, source, is_fake, confidence, explanation):
+# Statistics are memoized per "days" value and reused until the data version
+# changes. The recent window moves with time, so entries also expire after
+# STATS_CACHE_TTL seconds.
+DATA_VERSION_ID = "reports_data_version"
+STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", "300"))
+STATS_CACHE_MAX_ENTRIES = 32
+_statistics_cache = {}
+
+async def add_news_to_report(title, content, source, is_fake, confidence, explanation, analysis=None):
     """Add news analysis result to reports database"""
     # Create new report with timezone-aware timestamp
     # Using UTC timezone to avoid any timezone issues
     current_time = datetime.now(pytz.UTC)
     
     report = {
+        "_id": ObjectId(),
         "title": title,
         "content": content[:500] + ("..." if len(content) > 500 else ""),  # Truncate content for storage
         "source": source,
         "is_fake": is_fake,
         "confidence": confidence,
         "explanation": explanation,
-        "timestamp": current_time
+        "timestamp": current_time,
+        "content_hash": content_hash(title, content)
     }
+    if analysis:
+        report["analysis"] = analysis
     
-    # Insert into MongoDB
-    result = await reports_collection.insert_one(report)
-    report["id"] = str(result.inserted_id)
+    # Insert into MongoDB, with the heavy text in report_bodies
+    await insert_reports([report])
+    report["id"] = str(report["_id"])
+    await bump_data_version(1, current_time)
+    publish_report(report)
+    index_report(report)
     
     return report
 
-async def get_report_statistics(days=7):
-    """Generate statistics from reports"""
-    # Calculate cutoff date with timezone
-    cutoff_date = datetime.now(pytz.UTC) - timedelta(days=days)
-    
-    # Get all reports
-    cursor = reports_collection.find({})
-    reports = await cursor.to_list(length=None)
-    
-    # Ensure all timestamps are timezone-aware for comparison
+async def add_news_reports_bulk(results):
+    """
+    Add many analysis results with one insert_many call per collection.
+
+    results is a list of dicts with title, content, source, is_fake,
+    confidence and explanation.
+    """
+    if not results:
+        return 0
+    current_time = datetime.now(pytz.UTC)
+    reports = [
+        {
+            "_id": ObjectId(),
+            "title": r["title"],
+            "content": r["content"][:500] + ("..." if len(r["content"]) > 500 else ""),
+            "source": r.get("source"),
+            "is_fake": r["is_fake"],
+            "confidence": r["confidence"],
+            "explanation": r["explanation"],
+            "timestamp": current_time,
+            "content_hash": content_hash(r["title"], r["content"])
+        }
+        for r in results
+    ]
+    inserted = await insert_reports(reports)
+    await bump_data_version(inserted, current_time)
     for report in reports:
-        if "timestamp" in report and report["timestamp"] and not report["timestamp"].tzinfo:
-            report["timestamp"] = report["timestamp"].replace(tzinfo=pytz.UTC)
+        index_report(report)
+    return inserted
+
+async def find_cached_verdict(title, content):
+    """Return a stored verdict for the same article, from hot or archived reports"""
+    h = content_hash(title, content)
+    projection = {"is_fake": 1, "confidence": 1, "explanation": 1}
+    report = await reports_collection.find_one({"content_hash": h}, projection)
+    if report:
+        await attach_bodies([report])
+        return report["is_fake"], report["confidence"], report.get("explanation", "")
+    archived = await archive_collection.find_one({"content_hash": h})
+    if archived:
+        archived = expand_archived_report(archived)
+        return archived["is_fake"], archived["confidence"], archived["explanation"]
+    return None
+
+async def ensure_report_indexes():
+    """Index used to look up earlier verdicts for the same article"""
+    await reports_collection.create_index([("content_hash", ASCENDING)])
+
+async def bump_data_version(inserted, last_insert=None):
+    """
+    Record a write to the reports collection (or to data derived from it,
+    without last_insert) so cached statistics are refreshed
+    """
+    update = {"$inc": {"count": inserted}}
+    if last_insert is not None:
+        update["$max"] = {"last_insert": last_insert}
+    await metadata_collection.update_one({"_id": DATA_VERSION_ID}, update, upsert=True)
+
+async def get_data_version():
+    """
+    Get a cheap version stamp of the reports data (write count + last insert time)
+    """
+    version = await metadata_collection.find_one({"_id": DATA_VERSION_ID})
+    if version is None:
+        # Seed the stamp from existing data the first time it is needed
+        latest = await reports_collection.find_one({}, {"timestamp": 1}, sort=[("timestamp", -1)])
+        version = {
+            "count": await reports_collection.count_documents({}),
+            "last_insert": latest.get("timestamp") if latest else None
+        }
+        await metadata_collection.update_one(
+            {"_id": DATA_VERSION_ID},
+            {"$setOnInsert": version},
+            upsert=True
+        )
     
-    # Filter for recent reports
-    recent_reports = [r for r in reports if r["timestamp"] >= cutoff_date]
+    last_insert = version.get("last_insert")
+    last_insert_ms = int(last_insert.replace(tzinfo=pytz.UTC).timestamp() * 1000) if last_insert else 0
+    return f"{version.get('count', 0)}-{last_insert_ms}"
+
+async def get_statistics_etag(days=7):
+    """ETag for the statistics of the given period at the current data version"""
+    version = await get_data_version()
+    time_bucket = int(datetime.now(pytz.UTC).timestamp()) // STATS_CACHE_TTL
+    return f'W/"{version}-{time_bucket}-{days}"'
+
+async def get_report_statistics(days=7, etag=None):
+    """Get statistics from reports, reusing the memoized result when the data is unchanged"""
+    if etag is None:
+        etag = await get_statistics_etag(days)
     
-    # Calculate total counts
-    total_real = sum(1 for r in reports if not r["is_fake"])
-    total_fake = sum(1 for r in reports if r["is_fake"])
+    cached = _statistics_cache.get(days)
+    if cached and cached[0] == etag:
+        return cached[1]
     
-    # Calculate recent counts
-    recent_real = sum(1 for r in recent_reports if not r["is_fake"])
-    recent_fake = sum(1 for r in recent_reports if r["is_fake"])
+    stats = await _compute_report_statistics(days)
+    if len(_statistics_cache) >= STATS_CACHE_MAX_ENTRIES:
+        _statistics_cache.clear()
+    _statistics_cache[days] = (etag, stats)
+    return stats
+
+async def _compute_report_statistics(days=7):
+    """Generate statistics from reports"""
+    # Calculate cutoff date with timezone
+    cutoff_date = datetime.now(pytz.UTC) - timedelta(days=days)
+    
+    # Group hot and archived reports in the database and merge the results,
+    # so only the grouped counts are loaded rather than every report
+    results = [
+        await _aggregate_statistics(collection, cutoff_date)
+        for collection in (reports_collection, archive_collection)
+    ]
     
-    # Count by source
+    total = {"real": 0, "fake": 0, "total": 0}
+    recent = {"real": 0, "fake": 0, "total": 0}
     sources = {}
-    for report in reports:
-        source = report.get("source", "Unknown")
-        if source not in sources:
-            sources[source] = {"real": 0, "fake": 0, "total": 0}
+    daily_counts = {}
+    ranges = {"0.0-0.2": 0, "0.2-0.4": 0, "0.4-0.6": 0, "0.6-0.8": 0, "0.8-1.0": 0}
+    confidence_sum = 0.0
+    min_confidence = None
+    max_confidence = None
+    
+    for result in results:
+        for group in result["totals"]:
+            _add_count(total, group["_id"], group["count"])
+            _add_count(recent, group["_id"], group["recent"])
+            confidence_sum += group["confidence_sum"]
+            if min_confidence is None or group["min"] < min_confidence:
+                min_confidence = group["min"]
+            if max_confidence is None or group["max"] > max_confidence:
+                max_confidence = group["max"]
+        
+        # Count by source
+        for group in result["by_source"]:
+            counts = sources.setdefault(group["_id"]["source"], {"real": 0, "fake": 0, "total": 0})
+            _add_count(counts, group["_id"]["is_fake"], group["count"])
         
-        sources[source]["total"] += 1
-        if report["is_fake"]:
-            sources[source]["fake"] += 1
-        else:
-            sources[source]["real"] += 1
+        # Daily counts, by UTC date
+        for group in result["daily"]:
+            counts = daily_counts.setdefault(group["_id"]["day"], {"real": 0, "fake": 0, "total": 0})
+            _add_count(counts, group["_id"]["is_fake"], group["count"])
+        
+        # Distribution in ranges
+        for group in result["distribution"]:
+            ranges[group["_id"]] += group["count"]
     
     # Convert sources to StatCount objects
     by_source = {s: StatCount(**counts) for s, counts in sources.items()}
     
     # Calculate confidence statistics
-    if reports:
-        confidence_values = [r["confidence"] for r in reports]
-        avg_confidence = sum(confidence_values) / len(confidence_values)
-        min_confidence = min(confidence_values)
-        max_confidence = max(confidence_values)
-        
-        # Distribution in ranges
-        ranges = {"0.0-0.2": 0, "0.2-0.4": 0, "0.4-0.6": 0, "0.6-0.8": 0, "0.8-1.0": 0}
-        for c in confidence_values:
-            if c < 0.2:
-                ranges["0.0-0.2"] += 1
-            elif c < 0.4:
-                ranges["0.2-0.4"] += 1
-            elif c < 0.6:
-                ranges["0.4-0.6"] += 1
-            elif c < 0.8:
-                ranges["0.6-0.8"] += 1
-            else:
-                ranges["0.8-1.0"] += 1
+    if total["total"]:
+        avg_confidence = confidence_sum / total["total"]
     else:
         avg_confidence = 0
         min_confidence = 0
         max_confidence = 0
-        ranges = {"0.0-0.2": 0, "0.2-0.4": 0, "0.4-0.6": 0, "0.6-0.8": 0, "0.8-1.0": 0}
-    
-    # Daily counts - use timezone-aware timestamps for formatting
-    daily_counts = {}
-    for report in reports:
-        # Format timestamp with timezone info
-        date = report["timestamp"].strftime("%Y-%m-%d")
-        if date not in daily_counts:
-            daily_counts[date] = {"real": 0, "fake": 0, "total": 0}
-        
-        daily_counts[date]["total"] += 1
-        if report["is_fake"]:
-            daily_counts[date]["fake"] += 1
-        else:
-            daily_counts[date]["real"] += 1
     
     # Convert daily counts to StatCount objects
-    daily_stats = {d: StatCount(**counts) for d, counts in daily_counts.items()}
+    daily_stats = {d: StatCount(**counts) for d, counts in sorted(daily_counts.items())}
+    
+    sketch_stats = await _sketch_statistics(cutoff_date)
     
     # Create statistics response
     stats = ReportStatistics(
-        total_count=StatCount(real=total_real, fake=total_fake, total=total_real + total_fake),
-        recent_count=StatCount(real=recent_real, fake=recent_fake, total=recent_real + recent_fake),
+        total_count=StatCount(**total),
+        recent_count=StatCount(**recent),
         by_source=by_source,
         confidence_stats=ConfidenceStats(
             average=avg_confidence,
@@ -132,13 +233,85 @@ async def get_report_statistics(days=7):
             max=max_confidence,
             distribution=ranges
         ),
-        daily_counts=daily_stats
+        daily_counts=daily_stats,
+        **sketch_stats
     )
     
     return stats
 
-async def get_recent_reports(limit=10, fake_only=False):
-    """Get recent reports"""
+def _add_count(counts, is_fake, amount):
+    counts["fake" if is_fake else "real"] += amount
+    counts["total"] += amount
+
+async def _aggregate_statistics(collection, cutoff_date):
+    """Report counts by verdict, source, day and confidence range in one collection"""
+    pipeline = [
+        {"$project": {"is_fake": 1, "confidence": 1, "source": 1, "timestamp": 1}},
+        {"$facet": {
+            "totals": [{"$group": {
+                "_id": "$is_fake",
+                "count": {"$sum": 1},
+                "recent": {"$sum": {"$cond": [{"$gte": ["$timestamp", cutoff_date]}, 1, 0]}},
+                "confidence_sum": {"$sum": "$confidence"},
+                "min": {"$min": "$confidence"},
+                "max": {"$max": "$confidence"}
+            }}],
+            "by_source": [{"$group": {
+                "_id": {"source": {"$ifNull": ["$source", "Unknown"]}, "is_fake": "$is_fake"},
+                "count": {"$sum": 1}
+            }}],
+            "daily": [{"$group": {
+                "_id": {
+                    "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}},
+                    "is_fake": "$is_fake"
+                },
+                "count": {"$sum": 1}
+            }}],
+            "distribution": [{"$group": {
+                "_id": {"$switch": {
+                    "branches": [
+                        {"case": {"$lt": ["$confidence", 0.2]}, "then": "0.0-0.2"},
+                        {"case": {"$lt": ["$confidence", 0.4]}, "then": "0.2-0.4"},
+                        {"case": {"$lt": ["$confidence", 0.6]}, "then": "0.4-0.6"},
+                        {"case": {"$lt": ["$confidence", 0.8]}, "then": "0.6-0.8"}
+                    ],
+                    "default": "0.8-1.0"
+                }},
+                "count": {"$sum": 1}
+            }}]
+        }}
+    ]
+    result = await collection.aggregate(pipeline).to_list(length=1)
+    return result[0]
+
+def _quantile_stats(sketch):
+    return QuantileStats(
+        count=sketch.count,
+        p50=sketch.quantile(0.5),
+        p90=sketch.quantile(0.9),
+        p99=sketch.quantile(0.99)
+    )
+
+async def _sketch_statistics(cutoff_date):
+    """Confidence quantiles and distinct sources since cutoff_date, merged from daily rollups"""
+    daily, by_source = await load_rollups(cutoff_date.strftime("%Y-%m-%d"))
+    
+    period = QuantileSketch()
+    sources = HyperLogLog()
+    for sketch, day_sources in daily.values():
+        period.merge(sketch)
+        sources.merge(day_sources)
+    
+    return {
+        "confidence_quantiles": _quantile_stats(period),
+        "daily_confidence": {day: _quantile_stats(sketch) for day, (sketch, _) in sorted(daily.items())},
+        "source_confidence": {source: _quantile_stats(sketch) for source, sketch in by_source.items()},
+        "distinct_sources": sources.estimate(),
+        "daily_distinct_sources": {day: hll.estimate() for day, (_, hll) in sorted(daily.items())}
+    }
+
+async def get_recent_reports(limit=10, fake_only=False, include_body=False):
+    """Get recent reports, without content and explanation unless include_body is set"""
     # Build query
     query = {"is_fake": True} if fake_only else {}
     
@@ -146,6 +319,8 @@ async def get_recent_reports(limit=10, fake_only=False):
         # Get reports sorted by timestamp
         cursor = reports_collection.find(query).sort("timestamp", -1).limit(limit)
         reports = await cursor.to_list(length=limit)
+        if include_body:
+            await attach_bodies(reports)
         
         # Debug: print reports count
         print(f"Found {len(reports)} reports in MongoDB")
@@ -175,7 +350,7 @@ async def get_recent_reports(limit=10, fake_only=False):
                     processed_report["timestamp"] = timestamp.isoformat()
                 
                 # Ensure all required fields are present
-                required_fields = ["title", "content", "is_fake", "confidence", "explanation"]
+                required_fields = ["title", "is_fake", "confidence"]
                 missing_fields = [field for field in required_fields if field not in processed_report]
                 
                 if missing_fields:
@@ -203,6 +378,28 @@ async def get_recent_reports(limit=10, fake_only=False):
         # Fallback to empty list
         return []
 
+async def get_report(report_id):
+    """Get one report with its full text, from hot or archived reports"""
+    try:
+        object_id = ObjectId(report_id)
+    except Exception:
+        return None
+    
+    report = await reports_collection.find_one({"_id": object_id})
+    if report:
+        await attach_bodies([report])
+    else:
+        report = await archive_collection.find_one({"_id": object_id})
+        if report is None:
+            return None
+        report = expand_archived_report(report)
+    
+    report["id"] = str(report.pop("_id"))
+    timestamp = report.get("timestamp")
+    if timestamp and not timestamp.tzinfo:
+        report["timestamp"] = timestamp.replace(tzinfo=pytz.UTC)
+    return NewsReport(**report)
+
 async def generate_chart(chart_type, days=7, width=800, height=500):
     """Generate chart as PNG image"""
     stats = await get_report_statistics(days)
@@ -221,11 +418,8 @@ async def generate_chart(chart_type, days=7, width=800, height=500):
 
 async def _generate_pie_chart(stats, width, height):
     """Generate pie chart of fake vs real news"""
-    # Run in thread to avoid blocking
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None, _generate_pie_chart_sync, stats, width, height
-    )
+    # Run in the render process pool to avoid blocking
+    return await get_render_executor().run(_generate_pie_chart_sync, stats, width, height)
 
 def _generate_pie_chart_sync(stats, width, height):
     df = pd.DataFrame([
@@ -249,10 +443,7 @@ def _generate_pie_chart_sync(stats, width, height):
 
 async def _generate_trend_chart(stats, width, height):
     """Generate trend chart of fake news over time"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None, _generate_trend_chart_sync, stats, width, height
-    )
+    return await get_render_executor().run(_generate_trend_chart_sync, stats, width, height)
 
 def _generate_trend_chart_sync(stats, width, height):
     # Convert daily counts to DataFrame
@@ -286,10 +477,7 @@ def _generate_trend_chart_sync(stats, width, height):
 
 async def _generate_sources_chart(stats, width, height):
     """Generate chart of fake news by source"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None, _generate_sources_chart_sync, stats, width, height
-    )
+    return await get_render_executor().run(_generate_sources_chart_sync, stats, width, height)
 
 def _generate_sources_chart_sync(stats, width, height):
     # Convert source data to DataFrame
@@ -321,10 +509,7 @@ def _generate_sources_chart_sync(stats, width, height):
 
 async def _generate_confidence_chart(stats, width, height):
     """Generate confidence distribution histogram"""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None, _generate_confidence_chart_sync, stats, width, height
-    )
+    return await get_render_executor().run(_generate_confidence_chart_sync, stats, width, height)
 
 def _generate_confidence_chart_sync(stats, width, height):
     # Convert confidence distribution to DataFrame
@@ -0,0 +1,160 @@
+import os
+import asyncio
+import pytz
+from datetime import datetime, timedelta
+from pymongo import TEXT, ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+from dotenv import load_dotenv
+from ..config.mongodb import reports_collection, bodies_collection, archive_collection, metadata_collection
+from .body_service import (
+    content_hash, compress_text, decompress_text, attach_bodies, ignore_duplicates, report_terms, TEXT_INDEX_WEIGHTS
+)
+
+# Load environment variables
+load_dotenv()
+
+# Reports older than the hot window are compacted into the archive collection.
+# Setting RETENTION_HOT_DAYS to 0 keeps every report in the hot collection.
+RETENTION_HOT_DAYS = int(os.getenv("RETENTION_HOT_DAYS", "90"))
+RETENTION_INTERVAL_SECONDS = int(os.getenv("RETENTION_INTERVAL_SECONDS", "3600"))
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+
+LEASE_ID = "retention_lease"
+ARCHIVE_TEXT_INDEX = "archive_text"
+# Title-only text index of earlier versions; a collection has one text index
+LEGACY_ARCHIVE_TEXT_INDEX = "archive_title_text"
+
+_compaction_task = None
+
+
+def to_archive_document(report):
+    """Compact form of a report: small fields, search terms and compressed text"""
+    return {
+        "_id": report["_id"],
+        "title": report.get("title"),
+        "source": report.get("source"),
+        "is_fake": report.get("is_fake"),
+        "confidence": report.get("confidence"),
+        "timestamp": report.get("timestamp"),
+        "content_hash": report.get("content_hash") or content_hash(report.get("title", ""), report.get("content", "")),
+        # Keep the marker so the archive backfill does not count the report again
+        "rolled_up": bool(report.get("rolled_up")),
+        "terms": report_terms(report),
+        "text": compress_text({
+            "content": report.get("content", ""),
+            "explanation": report.get("explanation", ""),
+            "analysis": report.get("analysis")
+        })
+    }
+
+
+def expand_archived_report(doc):
+    """Restore the report fields of an archived document"""
+    doc = dict(doc)
+    doc.pop("terms", None)
+    doc.update(decompress_text(doc.pop("text")))
+    return doc
+
+
+async def ensure_archive_indexes():
+    await archive_collection.create_index([("timestamp", DESCENDING), ("_id", DESCENDING)])
+    await archive_collection.create_index([("content_hash", ASCENDING)])
+    try:
+        if LEGACY_ARCHIVE_TEXT_INDEX in await archive_collection.index_information():
+            await archive_collection.drop_index(LEGACY_ARCHIVE_TEXT_INDEX)
+        await archive_collection.create_index(
+            [(field, TEXT) for field in TEXT_INDEX_WEIGHTS],
+            weights=TEXT_INDEX_WEIGHTS,
+            name=ARCHIVE_TEXT_INDEX,
+            default_language="english"
+        )
+    except PyMongoError as e:
+        print(f"Archive text index unavailable: {e}")
+
+
+async def _acquire_lease(owner, duration):
+    """Make sure only one worker compacts at a time"""
+    now = datetime.now(pytz.UTC)
+    try:
+        await metadata_collection.find_one_and_update(
+            {"_id": LEASE_ID, "$or": [{"expires_at": {"$lt": now}}, {"owner": owner}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=duration)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        # Another worker holds an unexpired lease, so the upsert collided with it
+        return False
+
+
+async def compact_reports(hot_days=RETENTION_HOT_DAYS, batch_size=RETENTION_BATCH_SIZE):
+    """
+    Move reports older than the hot window into the archive.
+
+    Reports are copied in batches and the raw documents are deleted once
+    their archive copies exist, so an interrupted run can simply be repeated.
+    Returns the number of reports archived.
+    """
+    cutoff = datetime.now(pytz.UTC) - timedelta(days=hot_days)
+    archived = 0
+
+    while True:
+        batch = await reports_collection.find(
+            {"timestamp": {"$lt": cutoff}}
+        ).sort("_id", ASCENDING).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+
+        await attach_bodies(batch)
+        try:
+            await archive_collection.insert_many(
+                [to_archive_document(report) for report in batch], ordered=False
+            )
+        except BulkWriteError as e:
+            # Reports archived by an earlier, interrupted run are already there
+            ignore_duplicates(e)
+
+        ids = {"_id": {"$in": [r["_id"] for r in batch]}}
+        result = await reports_collection.delete_many(ids)
+        await bodies_collection.delete_many(ids)
+        archived += result.deleted_count
+
+        if len(batch) < batch_size:
+            break
+        # Yield between batches so compaction does not monopolize the database
+        await asyncio.sleep(0.1)
+
+    return archived
+
+
+async def _compaction_loop():
+    owner = f"{os.uname().nodename}:{os.getpid()}"
+    while True:
+        try:
+            if await _acquire_lease(owner, RETENTION_INTERVAL_SECONDS):
+                archived = await compact_reports()
+                if archived:
+                    print(f"Archived {archived} reports older than {RETENTION_HOT_DAYS} days")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error compacting reports: {e}")
+        await asyncio.sleep(RETENTION_INTERVAL_SECONDS)
+
+
+def start_compaction():
+    """Run report compaction periodically in the background"""
+    global _compaction_task
+    if RETENTION_HOT_DAYS > 0 and _compaction_task is None:
+        _compaction_task = asyncio.create_task(_compaction_loop())
+
+
+async def stop_compaction():
+    global _compaction_task
+    if _compaction_task is not None:
+        _compaction_task.cancel()
+        try:
+            await _compaction_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _compaction_task = None
@@ -0,0 +1,148 @@
+import pytz
+from pymongo import ASCENDING, UpdateOne, UpdateMany
+from pymongo.errors import BulkWriteError
+from ..config.mongodb import rollups_collection
+from ..utils.sketches import QuantileSketch, HyperLogLog
+
+# Confidence sketches are kept per UTC day ("day" rollups, which also count
+# distinct sources) and per day and source ("source" rollups). A period's
+# statistics are the merge of its daily rollups, so no confidence values are
+# ever loaded into memory.
+#
+# Reports counted in the rollups are marked rolled_up, so the backfill
+# migrations only read reports that were never counted.
+UNKNOWN_SOURCE = "Unknown"
+NOT_ROLLED_UP = {"rolled_up": {"$ne": True}}
+ROLLUP_FIELDS = {"confidence": 1, "source": 1, "timestamp": 1}
+# Batch tokens remembered per rollup, to skip a backfill batch replayed after a crash
+ROLLUP_BATCH_HISTORY = 16
+DUPLICATE_KEY_ERROR = 11000
+
+
+def _day(timestamp):
+    if not timestamp.tzinfo:
+        timestamp = timestamp.replace(tzinfo=pytz.UTC)
+    return timestamp.astimezone(pytz.UTC).strftime("%Y-%m-%d")
+
+
+def rollup_updates(reports, batch=None):
+    """
+    Build the upserts that add reports to their rollups.
+
+    Updates for the same rollup are combined first, so a batch costs one
+    write per day and per day and source. With a batch token, each rollup
+    records the token and skips an update carrying a token it already has,
+    so applying the same batch twice counts it once.
+    """
+    rollups = {}
+
+    def rollup(key, **fields):
+        return rollups.setdefault(key, {"fields": fields, "inc": {}, "max": {}})
+
+    for report in reports:
+        timestamp = report.get("timestamp")
+        confidence = report.get("confidence")
+        if timestamp is None or confidence is None:
+            continue
+        day = _day(timestamp)
+        source = report.get("source") or UNKNOWN_SOURCE
+        index = QuantileSketch.bucket_index(confidence)
+        bucket = "zero" if index is None else f"buckets.{index}"
+
+        for key, fields in (
+            (f"day:{day}", {"kind": "day", "day": day}),
+            (f"source:{day}:{source}", {"kind": "source", "day": day, "source": source})
+        ):
+            entry = rollup(key, **fields)
+            inc = entry["inc"]
+            inc["count"] = inc.get("count", 0) + 1
+            inc[bucket] = inc.get(bucket, 0) + 1
+
+        register, rank = HyperLogLog.register_for(source)
+        registers = rollups[f"day:{day}"]["max"]
+        registers[f"sources.{register}"] = max(rank, registers.get(f"sources.{register}", 0))
+
+    ops = []
+    for key, entry in rollups.items():
+        query = {"_id": key}
+        update = {"$setOnInsert": entry["fields"], "$inc": entry["inc"]}
+        if entry["max"]:
+            update["$max"] = entry["max"]
+        if batch is not None:
+            query["batches"] = {"$ne": batch}
+            update["$push"] = {"batches": {"$each": [batch], "$slice": -ROLLUP_BATCH_HISTORY}}
+        ops.append(UpdateOne(query, update, upsert=True))
+    return ops
+
+
+async def apply_rollup_updates(collection, ops):
+    """
+    Write rollup updates. An upsert whose batch token is already recorded
+    fails with a duplicate key on the existing rollup; that update was
+    applied before and is skipped.
+    """
+    if not ops:
+        return
+    try:
+        await collection.bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        if any(err.get("code") != DUPLICATE_KEY_ERROR for err in e.details.get("writeErrors", [])):
+            raise
+
+
+async def record_rollups(reports):
+    """Add newly stored reports, already marked rolled_up, to the confidence and source sketches"""
+    await apply_rollup_updates(rollups_collection, rollup_updates(reports))
+
+
+async def count_unrolled(collection):
+    """Reports in collection that were never added to the rollups"""
+    return await collection.count_documents(NOT_ROLLED_UP)
+
+
+async def backfill_rollups(collection, ctx, version):
+    """
+    Add the reports of collection that were never counted to the rollups,
+    for the backfill migration with the given version.
+
+    Reports stored through insert_reports are counted and marked rolled_up
+    as they are inserted, and compaction keeps the marker in the archive, so
+    only unmarked reports are read. Each batch is added under a batch token
+    and then marked, so a batch replayed after a crash is counted once.
+    """
+    # Imported here: the migrations and report_service both import this module
+    from ..migrations.runner import batched_bulk_write
+    from .report_service import bump_data_version
+
+    async def build_ops(reports):
+        batch = f"{version}:{reports[0]['_id']}"
+        await apply_rollup_updates(rollups_collection, rollup_updates(reports, batch))
+        # Refresh the memoized /api/statistics result and its ETag
+        await bump_data_version(len(reports))
+        return [UpdateMany({"_id": {"$in": [r["_id"] for r in reports]}}, {"$set": {"rolled_up": True}})]
+
+    await batched_bulk_write(collection, NOT_ROLLED_UP, build_ops, ctx, projection=ROLLUP_FIELDS)
+
+
+async def ensure_rollup_indexes():
+    await rollups_collection.create_index([("day", ASCENDING)])
+
+
+async def load_rollups(start_day):
+    """
+    Load the sketches of every day from start_day (a YYYY-MM-DD string) on.
+
+    Returns (daily, by_source): daily maps day to (QuantileSketch,
+    HyperLogLog), by_source maps source to its merged QuantileSketch.
+    """
+    daily = {}
+    by_source = {}
+    cursor = rollups_collection.find({"day": {"$gte": start_day}})
+    async for doc in cursor:
+        sketch = QuantileSketch(doc.get("buckets"), doc.get("zero", 0))
+        if doc["kind"] == "day":
+            daily[doc["day"]] = (sketch, HyperLogLog(doc.get("sources")))
+        else:
+            merged = by_source.setdefault(doc["source"], QuantileSketch())
+            merged.merge(sketch)
+    return daily, by_source
@@ -0,0 +1,307 @@
+import json
+import math
+import base64
+import pytz
+from collections import defaultdict
+from datetime import datetime
+from bson import ObjectId
+from pymongo import TEXT, DESCENDING, ASCENDING
+from pymongo.errors import OperationFailure
+from ..config.mongodb import reports_collection, bodies_collection, archive_collection
+from .retention_service import expand_archived_report
+from .body_service import tokenize, decompress_text, attach_bodies, TEXT_INDEX_WEIGHTS
+from ..models.report_models import SearchHit
+
+# The text index lives on report_bodies, which holds each report's title and
+# the distinct words of its content and explanation
+TEXT_INDEX_NAME = "report_bodies_text"
+SEARCH_FIELDS = ["title", "content", "explanation"]
+FALLBACK_WEIGHTS = {"title": 10, "content": 2, "explanation": 2}
+MAX_SEARCH_LIMIT = 100
+
+# Hot reports are searched first, then the archive, indexed on the same fields
+SEARCH_TIERS = ["hot", "archive"]
+
+# Set when the server cannot build a text index; searches then use an
+# in-process inverted index built at startup and updated on insert.
+_fallback_index = None
+
+
+class InvalidSearchCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+async def ensure_search_indexes():
+    """Create the text index and the indexes used by search filters"""
+    global _fallback_index
+
+    await reports_collection.create_index([("timestamp", DESCENDING), ("_id", DESCENDING)])
+    await reports_collection.create_index([("is_fake", ASCENDING), ("timestamp", DESCENDING)])
+    await reports_collection.create_index([("source", ASCENDING), ("timestamp", DESCENDING)])
+
+    try:
+        await bodies_collection.create_index(
+            [(field, TEXT) for field in TEXT_INDEX_WEIGHTS],
+            weights=TEXT_INDEX_WEIGHTS,
+            name=TEXT_INDEX_NAME,
+            default_language="english"
+        )
+        _fallback_index = None
+    except OperationFailure as e:
+        print(f"Text index unavailable, building in-process search index: {e}")
+        _fallback_index = InvertedIndex()
+        await _fallback_index.build()
+        print(f"Indexed {len(_fallback_index.documents)} reports for search")
+
+
+def index_report(report):
+    """Add a newly stored report to the in-process index when it is in use"""
+    if _fallback_index is not None:
+        _fallback_index.add(report)
+
+
+def encode_cursor(tier, sort_value=None, doc_id=None):
+    payload = json.dumps({"t": tier, "v": sort_value, "id": str(doc_id) if doc_id else None})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Returns (tier, after) where after is (sort_value, _id) or None"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if payload["t"] not in SEARCH_TIERS:
+            raise ValueError(payload["t"])
+        after = (payload["v"], ObjectId(payload["id"])) if payload["id"] else None
+        return payload["t"], after
+    except Exception:
+        raise InvalidSearchCursor("Invalid pagination cursor")
+
+
+def _build_filters(is_fake=None, source=None, start=None, end=None):
+    filters = {}
+    if is_fake is not None:
+        filters["is_fake"] = is_fake
+    if source:
+        filters["source"] = source
+    if start or end:
+        filters["timestamp"] = {}
+        if start:
+            filters["timestamp"]["$gte"] = start
+        if end:
+            filters["timestamp"]["$lt"] = end
+    return filters
+
+
+def _naive_utc(value):
+    """Convert a datetime to naive UTC, the form MongoDB returns"""
+    if value is not None and value.tzinfo:
+        return value.astimezone(pytz.UTC).replace(tzinfo=None)
+    return value
+
+
+def _to_search_hit(doc, score=None):
+    doc = dict(doc)
+    doc["id"] = str(doc.pop("_id"))
+    doc.pop("score", None)
+    timestamp = doc.get("timestamp")
+    if timestamp:
+        if not timestamp.tzinfo:
+            timestamp = timestamp.replace(tzinfo=pytz.UTC)
+        doc["timestamp"] = timestamp.isoformat()
+    return SearchHit(score=score, **doc)
+
+
+async def _search_collection(collection, query, filters, sort, limit, after):
+    """Fetch up to limit + 1 matches from one collection, after the keyset position"""
+    match = {"$text": {"$search": query}, **filters}
+
+    if sort == "recent":
+        if after:
+            after_ts = _naive_utc(datetime.fromisoformat(after[0]))
+            match["$or"] = [
+                {"timestamp": {"$lt": after_ts}},
+                {"timestamp": after_ts, "_id": {"$lt": after[1]}}
+            ]
+        return await collection.find(
+            match, {"score": {"$meta": "textScore"}}
+        ).sort([("timestamp", DESCENDING), ("_id", DESCENDING)]).limit(limit + 1).to_list(length=limit + 1)
+
+    pipeline = [
+        {"$match": match},
+        {"$addFields": {"score": {"$meta": "textScore"}}}
+    ]
+    if after:
+        pipeline.append({"$match": {"$or": [
+            {"score": {"$lt": after[0]}},
+            {"score": after[0], "_id": {"$lt": after[1]}}
+        ]}})
+    pipeline += [
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": limit + 1}
+    ]
+    return await collection.aggregate(pipeline).to_list(length=limit + 1)
+
+
+async def _hydrate_bodies(bodies):
+    """Combine matching bodies with their report documents, keeping the ranking order"""
+    reports = {
+        doc["_id"]: doc
+        async for doc in reports_collection.find({"_id": {"$in": [b["_id"] for b in bodies]}})
+    }
+    docs = []
+    for body in bodies:
+        # A report archived since the search started has no hot document any more
+        report = reports.get(body["_id"], {
+            k: body.get(k) for k in ("_id", "title", "source", "is_fake", "timestamp")
+        })
+        report.update(decompress_text(body["text"]))
+        report["score"] = body.get("score")
+        docs.append(report)
+    return docs
+
+
+async def search_reports(query, is_fake=None, source=None, start=None, end=None,
+                         sort="relevance", limit=20, cursor=None):
+    """
+    Search stored reports by title, content and explanation.
+
+    Results are ranked by text relevance or by recency. Hot reports come
+    first, followed by archived ones. Pagination is keyset based: pass the
+    returned next_cursor to fetch the following page.
+
+    Returns (hits, next_cursor).
+    """
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    tier, after = decode_cursor(cursor) if cursor else ("hot", None)
+    filters = _build_filters(is_fake, source, start, end)
+
+    if _fallback_index is not None:
+        return await _fallback_index.search(query, filters, sort, limit, after)
+
+    collections = {"hot": bodies_collection, "archive": archive_collection}
+    hits = []
+    next_cursor = None
+
+    for index in range(SEARCH_TIERS.index(tier), len(SEARCH_TIERS)):
+        tier = SEARCH_TIERS[index]
+        remaining = limit - len(hits)
+        try:
+            docs = await _search_collection(collections[tier], query, filters, sort, remaining, after)
+        except OperationFailure:
+            if tier == "hot":
+                raise
+            docs = []  # The archive has no text index on this server
+        after = None
+
+        if tier == "archive":
+            docs = [expand_archived_report(doc) for doc in docs]
+        else:
+            docs = await _hydrate_bodies(docs)
+        hits += [_to_search_hit(doc, doc.get("score")) for doc in docs[:remaining]]
+
+        if len(docs) > remaining:
+            last = docs[remaining - 1]
+            sort_value = last["timestamp"].isoformat() if sort == "recent" else last["score"]
+            next_cursor = encode_cursor(tier, sort_value, last["_id"])
+            break
+        if len(hits) == limit and index + 1 < len(SEARCH_TIERS):
+            # The page is full; continue from the start of the next tier
+            next_cursor = encode_cursor(SEARCH_TIERS[index + 1])
+            break
+
+    return hits, next_cursor
+
+
+class InvertedIndex:
+    """
+    Minimal in-memory inverted index used when MongoDB has no text index.
+
+    Postings hold weighted term frequencies per report. Only the filter fields
+    are kept in memory; matching documents are loaded from MongoDB per page.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.documents = {}  # report id -> (is_fake, source, timestamp)
+
+    async def build(self):
+        projection = {"title": 1, "is_fake": 1, "source": 1, "timestamp": 1, "content": 1, "explanation": 1}
+        batch = []
+        async for doc in reports_collection.find({}, projection):
+            batch.append(doc)
+            if len(batch) >= 500:
+                for report in await attach_bodies(batch):
+                    self.add(report)
+                batch = []
+        for report in await attach_bodies(batch):
+            self.add(report)
+        async for doc in archive_collection.find({}):
+            self.add(expand_archived_report(doc))
+
+    def add(self, doc):
+        doc_id = doc["_id"]
+        self.documents[doc_id] = (doc.get("is_fake"), doc.get("source"), _naive_utc(doc.get("timestamp")))
+        for field in SEARCH_FIELDS:
+            weight = FALLBACK_WEIGHTS[field]
+            for token in tokenize(doc.get(field)):
+                postings = self.postings[token]
+                postings[doc_id] = postings.get(doc_id, 0) + weight
+
+    def _matches(self, doc_id, filters):
+        is_fake, source, timestamp = self.documents[doc_id]
+        if "is_fake" in filters and is_fake != filters["is_fake"]:
+            return False
+        if "source" in filters and source != filters["source"]:
+            return False
+        bounds = filters.get("timestamp", {})
+        if bounds and timestamp is None:
+            return False
+        if "$gte" in bounds and timestamp < _naive_utc(bounds["$gte"]):
+            return False
+        if "$lt" in bounds and timestamp >= _naive_utc(bounds["$lt"]):
+            return False
+        return True
+
+    async def search(self, query, filters, sort, limit, after):
+        total = max(1, len(self.documents))
+        scores = defaultdict(float)
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            for doc_id, tf in postings.items():
+                scores[doc_id] += (1 + math.log(tf)) * idf
+
+        if sort == "recent":
+            key = lambda doc_id: (self.documents[doc_id][2] or datetime.min, doc_id)
+            after_key = (_naive_utc(datetime.fromisoformat(after[0])), after[1]) if after else None
+        else:
+            key = lambda doc_id: (scores[doc_id], doc_id)
+            after_key = after
+
+        ranked = sorted(
+            (doc_id for doc_id in scores if self._matches(doc_id, filters)),
+            key=key,
+            reverse=True
+        )
+        if after_key:
+            ranked = [doc_id for doc_id in ranked if key(doc_id) < after_key]
+
+        page = ranked[:limit + 1]
+        ids = {"_id": {"$in": page[:limit]}}
+        docs = {doc["_id"]: doc for doc in await attach_bodies(await reports_collection.find(ids).to_list(length=limit))}
+        if len(docs) < len(page[:limit]):
+            # Reports moved to the archive since they were indexed
+            for doc in await archive_collection.find(ids).to_list(length=limit):
+                docs.setdefault(doc["_id"], expand_archived_report(doc))
+
+        hits = [_to_search_hit(docs[doc_id], scores[doc_id]) for doc_id in page[:limit] if doc_id in docs]
+        next_cursor = None
+        if len(page) > limit:
+            last = page[limit - 1]
+            sort_value = key(last)[0]
+            if isinstance(sort_value, datetime):
+                sort_value = sort_value.isoformat()
+            next_cursor = encode_cursor("hot", sort_value, last)
+        return hits, next_cursor
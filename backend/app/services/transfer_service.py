@@ -0,0 +1,198 @@
+import os
+import json
+import time
+import struct
+import hashlib
+import pytz
+from datetime import datetime
+from bson import ObjectId
+from bson.errors import InvalidId
+from ..config.mongodb import reports_collection, archive_collection
+from .retention_service import expand_archived_report
+from .body_service import content_hash, insert_reports, attach_bodies
+from .report_service import bump_data_version
+
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+
+
+def serialize_report(doc):
+    """Convert a stored report into one NDJSON line"""
+    doc = dict(doc)
+    doc["_id"] = str(doc["_id"])
+    timestamp = doc.get("timestamp")
+    if timestamp:
+        if not timestamp.tzinfo:
+            timestamp = timestamp.replace(tzinfo=pytz.UTC)
+        doc["timestamp"] = timestamp.isoformat()
+    return json.dumps(doc, default=str) + "\n"
+
+
+def legacy_object_id(record, timestamp):
+    """
+    Deterministic _id for a record that has no exported _id.
+
+    Like a generated ObjectId it starts with the report time, so _id order
+    still follows time. The rest is derived from the legacy reports.json id,
+    or from the article hash and timestamp, so importing the same record
+    again hits a duplicate key instead of storing a second copy.
+    """
+    legacy_id = record.get("id")
+    if legacy_id not in (None, ""):
+        seed = f"id:{legacy_id}"
+    else:
+        article = content_hash(record.get("title", ""), record.get("content", ""))
+        seed = f"hash:{article}:{timestamp.isoformat() if timestamp else ''}"
+    seconds = int(timestamp.timestamp()) if timestamp else 0
+    digest = hashlib.sha256(seed.encode("utf-8")).digest()
+    return ObjectId(struct.pack(">I", seconds & 0xFFFFFFFF) + digest[:8])
+
+
+def deserialize_report(record):
+    """Convert an exported (or legacy reports.json) record into a report document"""
+    record = dict(record)
+
+    timestamp = record.get("timestamp")
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+        if not timestamp.tzinfo:
+            timestamp = timestamp.replace(tzinfo=pytz.UTC)
+        record["timestamp"] = timestamp
+
+    try:
+        record["_id"] = ObjectId(record["_id"])
+    except (KeyError, InvalidId, TypeError):
+        record["_id"] = legacy_object_id(record, record.get("timestamp"))
+    record.pop("id", None)  # legacy id from reports.json, replaced by _id
+    return record
+
+
+async def iter_export_lines(include_archive=True):
+    """
+    Stream all reports as NDJSON lines straight from MongoDB cursors.
+
+    Memory use is bounded by the cursor batch size, whatever the collection size.
+    """
+    batch = []
+    async for doc in reports_collection.find({}).batch_size(EXPORT_BATCH_SIZE):
+        batch.append(doc)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            for report in await attach_bodies(batch):
+                yield serialize_report(report)
+            batch = []
+    for report in await attach_bodies(batch):
+        yield serialize_report(report)
+
+    if include_archive:
+        async for doc in archive_collection.find({}).batch_size(EXPORT_BATCH_SIZE):
+            yield serialize_report(expand_archived_report(doc))
+
+
+def iter_records(fp, chunk_size=65536):
+    """
+    Stream records from an NDJSON file or a JSON array file without loading it whole.
+    """
+    first = fp.read(1)
+    while first and first.isspace():
+        first = fp.read(1)
+    if not first:
+        return
+
+    if first != "[":
+        # NDJSON: one record per line
+        line = first + fp.readline()
+        while line:
+            if line.strip():
+                yield json.loads(line)
+            line = fp.readline()
+        return
+
+    # JSON array: decode one element at a time from a sliding buffer
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(",").lstrip()
+        if buffer.startswith("]"):
+            return
+        try:
+            record, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                if buffer.strip():
+                    raise
+                return
+            chunk = fp.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield record
+        buffer = buffer[end:]
+
+
+def _read_checkpoint(path):
+    if path and os.path.exists(path):
+        with open(path, "r") as file:
+            return json.load(file).get("records_done", 0)
+    return 0
+
+
+def _write_checkpoint(path, records_done):
+    if not path:
+        return
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump({"records_done": records_done}, file)
+    os.replace(tmp_path, path)
+
+
+async def import_reports(path, batch_size=IMPORT_BATCH_SIZE, checkpoint_path=None, progress=print):
+    """
+    Import reports from an NDJSON or JSON array file in bounded batches.
+
+    After every batch the number of records handled is written to
+    checkpoint_path, so a crashed import resumes where it stopped. Exported
+    records keep their _id and legacy records get a deterministic one, so a
+    batch replayed after a crash is skipped rather than inserted twice.
+
+    Returns (records_read, records_inserted).
+    """
+    skip = _read_checkpoint(checkpoint_path)
+    if skip:
+        progress(f"Resuming after {skip} records")
+
+    records_done = 0
+    inserted = 0
+    last_timestamp = None
+    batch = []
+    started = time.monotonic()
+
+    async def flush():
+        nonlocal inserted, records_done, batch
+        # Reports that already exist are skipped
+        inserted += await insert_reports(batch)
+        records_done += len(batch)
+        batch = []
+        _write_checkpoint(checkpoint_path, records_done)
+        elapsed = max(time.monotonic() - started, 1e-6)
+        progress(f"{records_done} records processed, {inserted} inserted "
+                 f"({(records_done - skip) / elapsed:.0f} records/s)")
+
+    with open(path, "r", encoding="utf-8") as file:
+        for record in iter_records(file):
+            if records_done < skip:
+                records_done += 1
+                continue
+            report = deserialize_report(record)
+            timestamp = report.get("timestamp")
+            if timestamp and (last_timestamp is None or timestamp > last_timestamp):
+                last_timestamp = timestamp
+            batch.append(report)
+            if len(batch) >= batch_size:
+                await flush()
+        if batch:
+            await flush()
+
+    if inserted:
+        await bump_data_version(inserted, last_timestamp or datetime.now(pytz.UTC))
+    return records_done, inserted
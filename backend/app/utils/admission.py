@@ -0,0 +1,150 @@
+import os
+import math
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+from .executors import GEMINI_WORKERS_PER_KEY
+
+# Load environment variables
+load_dotenv()
+
+# Priority classes, highest first. A free slot always goes to the highest
+# class with queued work; within a class, clients take turns.
+INTERACTIVE = 0  # /api/detect
+ANALYZE = 1      # /api/analyze
+BULK = 2         # /api/upload and batch jobs
+PRIORITY_NAMES = ["interactive", "analyze", "bulk"]
+
+# Queue limits per class and per client within a class. Work beyond them is
+# rejected at once (HTTP 429) rather than waiting indefinitely.
+ADMISSION_QUEUE_LIMITS = [
+    int(os.getenv("ADMISSION_QUEUE_INTERACTIVE", "32")),
+    int(os.getenv("ADMISSION_QUEUE_ANALYZE", "16")),
+    int(os.getenv("ADMISSION_QUEUE_BULK", "8")),
+]
+ADMISSION_MAX_QUEUED_PER_CLIENT = int(os.getenv("ADMISSION_MAX_QUEUED_PER_CLIENT", "4"))
+
+# Initial guess of how long admitted work holds a slot, refined as calls finish
+INITIAL_SERVICE_SECONDS = 2.0
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a priority class (or one client's share of it) is full"""
+
+    def __init__(self, priority, retry_after):
+        self.priority = priority
+        self.retry_after = retry_after
+        super().__init__(
+            f"Too many {PRIORITY_NAMES[priority]} requests are waiting; retry in {retry_after}s"
+        )
+
+
+class AdmissionController:
+    """
+    Limit concurrent work to a fixed number of slots, with priority classes
+    and per-client fair queuing.
+
+    Queued requests wait on futures grouped by class and client. When a slot
+    frees up it is handed to the first client of the highest non-empty class,
+    and that client moves to the back of its class, so one client sending
+    many requests cannot starve others of the same class.
+    """
+
+    def __init__(self, name, capacity, queue_limits=ADMISSION_QUEUE_LIMITS,
+                 max_per_client=ADMISSION_MAX_QUEUED_PER_CLIENT):
+        self.name = name
+        self.capacity = capacity
+        self.queue_limits = queue_limits
+        self.max_per_client = max_per_client
+        self._active = 0
+        self._queues = [OrderedDict() for _ in PRIORITY_NAMES]  # client -> deque of futures
+        self._queued = [0 for _ in PRIORITY_NAMES]
+        self._rejected = [0 for _ in PRIORITY_NAMES]
+        self._service_seconds = INITIAL_SERVICE_SECONDS
+
+    def retry_after(self, priority):
+        """Seconds until a request of this class could expect a free slot"""
+        ahead = sum(self._queued[:priority + 1])
+        return max(1, math.ceil((ahead + 1) * self._service_seconds / self.capacity))
+
+    def snapshot(self):
+        return {
+            "capacity": self.capacity,
+            "active": self._active,
+            "queued": dict(zip(PRIORITY_NAMES, self._queued)),
+            "rejected": dict(zip(PRIORITY_NAMES, self._rejected)),
+            "service_seconds": round(self._service_seconds, 3)
+        }
+
+    @asynccontextmanager
+    async def admit(self, priority, client):
+        """Hold one slot for the body of the block, waiting for it if needed"""
+        await self._acquire(priority, client)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self._service_seconds += SERVICE_TIME_SMOOTHING * (elapsed - self._service_seconds)
+            self._release()
+
+    async def _acquire(self, priority, client):
+        if self._active < self.capacity and not any(self._queued):
+            self._active += 1
+            return
+
+        clients = self._queues[priority]
+        waiters = clients.get(client)
+        if (self._queued[priority] >= self.queue_limits[priority]
+                or (waiters and len(waiters) >= self.max_per_client)):
+            self._rejected[priority] += 1
+            raise AdmissionRejected(priority, self.retry_after(priority))
+
+        future = asyncio.get_event_loop().create_future()
+        clients.setdefault(client, deque()).append(future)
+        self._queued[priority] += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            else:
+                self._discard(priority, client, future)
+            raise
+
+    def _discard(self, priority, client, future):
+        waiters = self._queues[priority].get(client)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            self._queued[priority] -= 1
+            if not waiters:
+                del self._queues[priority][client]
+
+    def _release(self):
+        """Hand the slot to the next waiter, or free it"""
+        for priority, clients in enumerate(self._queues):
+            while clients:
+                client, waiters = clients.popitem(last=False)
+                future = waiters.popleft()
+                self._queued[priority] -= 1
+                if waiters:
+                    clients[client] = waiters  # back of the line for this class
+                if not future.done():
+                    future.set_result(None)
+                    return
+        self._active -= 1
+
+
+_gemini_admission = None
+
+
+def get_gemini_admission(key_count=1):
+    """Admission control in front of the Gemini thread pool, one slot per worker"""
+    global _gemini_admission
+    if _gemini_admission is None:
+        _gemini_admission = AdmissionController("gemini", max(1, key_count * GEMINI_WORKERS_PER_KEY))
+    return _gemini_admission
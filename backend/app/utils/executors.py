@@ -0,0 +1,108 @@
+import os
+import asyncio
+import multiprocessing
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Executor sizing. Gemini calls are network-bound and limited by how many
+# requests the API keys can serve at once, so that pool is sized per key.
+# Chart rendering is CPU-bound and runs in separate processes to stay off the GIL.
+# Those processes are spawned rather than forked: forking a worker that already
+# runs Motor and Gemini threads can copy held locks into the child and deadlock.
+GEMINI_WORKERS_PER_KEY = int(os.getenv("GEMINI_WORKERS_PER_KEY", "4"))
+GEMINI_MAX_PENDING = int(os.getenv("GEMINI_MAX_PENDING", "64"))
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(os.cpu_count() or 1, 4))))
+RENDER_MAX_PENDING = int(os.getenv("RENDER_MAX_PENDING", "16"))
+
+
+class ExecutorSaturated(Exception):
+    """Raised when an executor's queue is full and new work is rejected"""
+
+    def __init__(self, name, max_pending):
+        self.name = name
+        self.max_pending = max_pending
+        super().__init__(f"The {name} executor is saturated ({max_pending} pending tasks)")
+
+
+class BoundedExecutor:
+    """
+    Wrap an executor with a limit on submitted-but-unfinished tasks.
+
+    Work beyond the limit is rejected immediately with ExecutorSaturated
+    instead of waiting in an unbounded queue.
+    """
+
+    def __init__(self, name, factory, max_workers, max_pending):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._factory = factory
+        self._executor = None
+        self._pending = 0
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = self._factory(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, func, *args):
+        """Run func(*args) in the executor, rejecting fast when saturated"""
+        if self._pending >= self.max_pending:
+            raise ExecutorSaturated(self.name, self.max_pending)
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_gemini_executor = None
+_render_executor = None
+
+
+def get_gemini_executor(key_count=1):
+    """Thread pool for blocking Gemini API calls, sized to key capacity"""
+    global _gemini_executor
+    if _gemini_executor is None:
+        _gemini_executor = BoundedExecutor(
+            "gemini",
+            ThreadPoolExecutor,
+            max_workers=max(1, key_count * GEMINI_WORKERS_PER_KEY),
+            max_pending=GEMINI_MAX_PENDING
+        )
+    return _gemini_executor
+
+
+def get_render_executor():
+    """Process pool for CPU-bound work such as chart rendering"""
+    global _render_executor
+    if _render_executor is None:
+        _render_executor = BoundedExecutor(
+            "render",
+            partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")),
+            max_workers=max(1, RENDER_WORKERS),
+            max_pending=RENDER_MAX_PENDING
+        )
+    return _render_executor
+
+
+def shutdown_executors():
+    """Release executor threads and worker processes"""
+    for executor in (_gemini_executor, _render_executor):
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,116 @@
+import math
+import hashlib
+
+# Quantile sketch accuracy. Any quantile read from a QuantileSketch is within
+# QUANTILE_RELATIVE_ERROR (relative) of a value whose true rank is that
+# quantile. Values at or below QUANTILE_MIN_VALUE are counted as zero.
+QUANTILE_RELATIVE_ERROR = 0.01
+QUANTILE_MIN_VALUE = 1e-3
+
+# HyperLogLog with 2^10 registers: standard error 1.04 / sqrt(1024) ~= 3.25%
+HLL_PRECISION = 10
+HLL_REGISTERS = 1 << HLL_PRECISION
+HLL_STANDARD_ERROR = 1.04 / math.sqrt(HLL_REGISTERS)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch).
+
+    Values fall into logarithmic buckets, so a sketch is just a map of bucket
+    index to count. Two sketches merge by adding counts, which lets the
+    buckets live in MongoDB and be updated with $inc from any worker.
+    """
+
+    gamma = (1 + QUANTILE_RELATIVE_ERROR) / (1 - QUANTILE_RELATIVE_ERROR)
+    _log_gamma = math.log(gamma)
+
+    def __init__(self, buckets=None, zero_count=0):
+        self.buckets = {int(k): v for k, v in (buckets or {}).items()}
+        self.zero_count = zero_count
+
+    @classmethod
+    def bucket_index(cls, value):
+        """Bucket for a value, or None for the zero bucket"""
+        if value <= QUANTILE_MIN_VALUE:
+            return None
+        return math.ceil(math.log(value) / cls._log_gamma)
+
+    @classmethod
+    def bucket_value(cls, index):
+        return 2 * cls.gamma ** index / (cls.gamma + 1)
+
+    @property
+    def count(self):
+        return self.zero_count + sum(self.buckets.values())
+
+    def add(self, value, count=1):
+        index = self.bucket_index(value)
+        if index is None:
+            self.zero_count += count
+        else:
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def merge(self, other):
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        return self
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1), or None for an empty sketch"""
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return self.bucket_value(index)
+        return self.bucket_value(max(self.buckets))
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct-count sketch.
+
+    Registers are stored sparsely as index -> rank. Two sketches merge by
+    taking the maximum of each register, which MongoDB does with $max.
+    """
+
+    def __init__(self, registers=None):
+        self.registers = {int(k): v for k, v in (registers or {}).items()}
+
+    @staticmethod
+    def register_for(value):
+        """(register index, rank) of a value's 64-bit hash"""
+        digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+        h = int.from_bytes(digest, "big")
+        index = h >> (64 - HLL_PRECISION)
+        remainder = h & ((1 << (64 - HLL_PRECISION)) - 1)
+        rank = (64 - HLL_PRECISION) - remainder.bit_length() + 1
+        return index, rank
+
+    def add(self, value):
+        index, rank = self.register_for(value)
+        if rank > self.registers.get(index, 0):
+            self.registers[index] = rank
+
+    def merge(self, other):
+        for index, rank in other.registers.items():
+            if rank > self.registers.get(index, 0):
+                self.registers[index] = rank
+        return self
+
+    def estimate(self):
+        m = HLL_REGISTERS
+        zeros = m - len(self.registers)
+        harmonic = zeros + sum(2.0 ** -rank for rank in self.registers.values())
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m / harmonic
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+# Allow importing the app package when run as "python scripts/benchmark_classify.py"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "--stub" in sys.argv:
+    # The stand-in replaces the API, so no real key is needed
+    os.environ.setdefault("GEMINI_API_KEY", "local-stub")
+
+from app.services import gemini_service
+from app.services.gemini_service import (
+    call_gemini, generate_classification, parse_classification, ClassificationParseError
+)
+
+# Used when no input file is given
+SAMPLE_ARTICLES = [
+    {
+        "title": "City council approves new budget for public transport",
+        "content": "The city council voted 7-2 on Tuesday to approve a budget that increases "
+                   "funding for bus routes by 4%, according to minutes published on the city website."
+    },
+    {
+        "title": "Doctors hate this one weird trick that cures everything",
+        "content": "A shocking secret the mainstream media won't tell you: drinking lemon water "
+                   "cures all diseases overnight. Government cover-up exposed!"
+    },
+    {
+        "title": "Study finds moderate exercise linked to better sleep",
+        "content": "Researchers surveyed 2,000 adults and found that those who exercised three times "
+                   "a week reported falling asleep faster. The authors note the study was observational."
+    },
+]
+
+class StubGemini:
+    """
+    Local Gemini stand-in for the two prompt modes.
+
+    Latency grows with the number of output tokens, as generation time does.
+    The free-form prompt gets a long explanation, usually inside code fences
+    and sometimes after a line of prose; the structured mode gets a short
+    explanation as bare JSON and is rarely cut off at the output cap. Answers
+    are seeded from the prompt, so both modes see the same verdicts.
+    """
+
+    uses_api_keys = False
+
+    def __init__(self, first_token_seconds, seconds_per_token, time_scale):
+        self.first_token_seconds = first_token_seconds
+        self.seconds_per_token = seconds_per_token
+        self.time_scale = time_scale
+        self.calls = 0
+
+    def generate(self, model_name, config, prompt):
+        structured = "response_schema" in config
+        article = prompt.split("Title:", 1)[-1].split("Set is_fake", 1)[0].split("Please provide", 1)[0]
+        seed = int(hashlib.sha256(article.encode("utf-8")).hexdigest(), 16)
+        is_fake = random.Random(seed).random() < 0.5
+        rng = random.Random(f"{seed}-{structured}-{self.calls}")
+        self.calls += 1
+
+        confidence = rng.uniform(0.6, 0.95) if is_fake else rng.uniform(0.05, 0.4)
+        words = rng.randint(40, 90) if structured else rng.randint(150, 320)
+        answer = json.dumps({
+            "is_fake": is_fake,
+            "confidence": round(confidence, 2),
+            "explanation": " ".join(["reason"] * words)
+        }, indent=None if structured else 4)
+
+        if structured:
+            text = answer[:len(answer) // 2] if rng.random() < 0.005 else answer
+        else:
+            roll = rng.random()
+            if roll < 0.6:
+                text = f"```json\n{answer}\n```"
+            elif roll < 0.7:
+                text = f"Here is my analysis of the article:\n{answer}"
+            else:
+                text = answer
+
+        output_tokens = max(1, len(text) // 4)
+        latency = (self.first_token_seconds + output_tokens * self.seconds_per_token) * math.exp(rng.gauss(0, 0.15))
+        time.sleep(latency * self.time_scale)
+        usage = SimpleNamespace(prompt_token_count=len(prompt) // 4, candidates_token_count=output_tokens)
+        return SimpleNamespace(text=text, usage_metadata=usage, latency=latency)
+
+def _timed_classification(title, content, structured):
+    """Run one classification and measure latency, output tokens and parse success"""
+    started = time.perf_counter()
+    response = generate_classification(title, content, structured)
+    # The stand-in reports its simulated latency rather than the scaled sleep
+    latency = getattr(response, "latency", None) or time.perf_counter() - started
+
+    usage = getattr(response, "usage_metadata", None)
+    output_tokens = getattr(usage, "candidates_token_count", None) if usage else None
+
+    text = response.text
+    if not structured and "```" in text:
+        # The free-form prompt often wraps its JSON in code fences
+        text = text.split("```json")[1] if "```json" in text else text.split("```")[1]
+        text = text.split("```")[0]
+    try:
+        parse_classification(text.strip())
+        parsed = True
+    except ClassificationParseError:
+        parsed = False
+    return latency, output_tokens, parsed
+
+def load_articles(path):
+    if not path:
+        return SAMPLE_ARTICLES
+    with open(path, "r", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+def summarize(label, results):
+    latencies = sorted(r[0] for r in results)
+    tokens = [r[1] for r in results if r[1] is not None]
+    failures = sum(1 for r in results if not r[2])
+    p90 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))]
+    print(f"{label:<12} n={len(results):<4} "
+          f"latency mean={statistics.mean(latencies):.2f}s p50={statistics.median(latencies):.2f}s p90={p90:.2f}s | "
+          f"output tokens mean={statistics.mean(tokens) if tokens else float('nan'):.0f} | "
+          f"parse failures={failures / len(results):.1%}")
+
+async def benchmark(path, repeat):
+    articles = load_articles(path) * repeat
+    for structured, label in ((False, "free-form"), (True, "structured")):
+        results = []
+        for article in articles:
+            results.append(await call_gemini(
+                _timed_classification, article["title"], article["content"], structured
+            ))
+        summarize(label, results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare latency, output tokens and parse failures of the free-form and structured classification prompts"
+    )
+    parser.add_argument("--input", help="JSONL file of articles with title and content (default: built-in samples)")
+    parser.add_argument("--repeat", type=int, default=3, help="Times to classify each article per mode")
+    parser.add_argument("--stub", action="store_true",
+                        help="Use a local Gemini stand-in instead of the API (or set GEMINI_TRANSPORT=replay to use a cassette)")
+    parser.add_argument("--first-token-latency", type=float, default=0.35, help="Stand-in latency before the first token, in seconds")
+    parser.add_argument("--token-latency", type=float, default=0.006, help="Stand-in latency per output token, in seconds")
+    parser.add_argument("--time-scale", type=float, default=0.02, help="Fraction of the stand-in latency actually slept")
+    args = parser.parse_args()
+
+    if args.stub:
+        gemini_service.TRANSPORT = StubGemini(args.first_token_latency, args.token_latency, args.time_scale)
+
+    asyncio.run(benchmark(args.input, args.repeat))
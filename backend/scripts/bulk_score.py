@@ -0,0 +1,196 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+
+# Allow importing the app package when run as "python scripts/bulk_score.py"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.gemini_service import classify_news, API_KEYS, GEMINI_STATS
+from app.services.quota_ledger import QuotaExhausted
+from app.services.report_service import add_news_reports_bulk, find_cached_verdict, ensure_report_indexes
+from app.services.transfer_service import iter_records
+from app.utils.executors import GEMINI_MAX_PENDING
+
+PROGRESS_INTERVAL_SECONDS = 10
+# Attempts per article for errors other than rate limits, and the first backoff
+ERROR_ATTEMPTS = 3
+ERROR_BACKOFF_SECONDS = 2
+
+def iter_articles(path):
+    """Stream articles from a CSV file (with a header row) or a JSONL file"""
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        records = csv.DictReader(file) if path.lower().endswith(".csv") else iter_records(file)
+        for record in records:
+            yield {
+                "title": record.get("title") or "",
+                "content": record.get("content") or record.get("text") or "",
+                "source": record.get("source") or None
+            }
+
+def count_articles(path):
+    return sum(1 for _ in iter_articles(path))
+
+def read_checkpoint(path):
+    if os.path.exists(path):
+        with open(path, "r") as file:
+            return json.load(file)
+    return {"next_index": 0, "output_offset": 0}
+
+def write_checkpoint(path, next_index, output_offset):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump({"next_index": next_index, "output_offset": output_offset}, file)
+    os.replace(tmp_path, path)
+
+async def score_article(article, stats):
+    """Classify one article, reusing a stored verdict for the same text when there is one"""
+    cached = await find_cached_verdict(article["title"], article["content"])
+    if cached:
+        stats["cached"] += 1
+        return cached, True
+
+    attempt = 1
+    while True:
+        try:
+            return await classify_news(article["title"], article["content"], allow_fallback=False), False
+        except QuotaExhausted as e:
+            # Wait for key capacity instead of storing keyword-fallback verdicts
+            await asyncio.sleep(e.retry_after)
+        except Exception:
+            # Retry transient API errors a few times before giving up on the article
+            if attempt >= ERROR_ATTEMPTS:
+                raise
+            await asyncio.sleep(ERROR_BACKOFF_SECONDS * 2 ** (attempt - 1))
+            attempt += 1
+
+async def bulk_score(input_path, output_path, concurrency, batch_size, store=True):
+    checkpoint_path = output_path + ".checkpoint"
+    checkpoint = read_checkpoint(checkpoint_path)
+    start_index = checkpoint["next_index"]
+
+    print(f"Counting articles in {input_path}...")
+    total = count_articles(input_path)
+    print(f"{total} articles, starting at {start_index}, {concurrency} requests in flight")
+
+    await ensure_report_indexes()
+
+    # Drop output written after the last checkpoint; those articles are scored again
+    output = open(output_path, "r+" if os.path.exists(output_path) else "w", encoding="utf-8")
+    output.truncate(checkpoint["output_offset"])
+    output.seek(checkpoint["output_offset"])
+
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    finished = {}  # results waiting to be written in input order
+    # Articles are only handed out up to this far past the next one to write, so
+    # one article stuck waiting for quota cannot make finished grow without bound
+    window = concurrency * 4
+    written = asyncio.Condition()
+    pending_reports = []
+    state = {"next_index": start_index, "checkpointed": start_index}
+    stats = {"scored": 0, "cached": 0, "errors": 0}
+    write_lock = asyncio.Lock()
+    started = time.monotonic()
+
+    async def save_reports():
+        if store and pending_reports:
+            await add_news_reports_bulk(pending_reports)
+        pending_reports.clear()
+        output.flush()
+        write_checkpoint(checkpoint_path, state["next_index"], output.tell())
+        state["checkpointed"] = state["next_index"]
+
+    async def write_ready():
+        # Results are written in input order so the checkpoint is a single index
+        async with write_lock:
+            while state["next_index"] in finished:
+                article, result = finished.pop(state["next_index"])
+                output.write(json.dumps(result) + "\n")
+                if store and "error" not in result and not result["cached"]:
+                    pending_reports.append({**article, **result})
+                state["next_index"] += 1
+                if state["next_index"] - state["checkpointed"] >= batch_size:
+                    await save_reports()
+        async with written:
+            written.notify_all()
+
+    async def producer():
+        for index, article in enumerate(iter_articles(input_path)):
+            if index >= start_index:
+                async with written:
+                    await written.wait_for(lambda: index - state["next_index"] < window)
+                await queue.put((index, article))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            index, article = item
+            try:
+                (is_fake, confidence, explanation), cached = await score_article(article, stats)
+                result = {
+                    "index": index,
+                    "title": article["title"],
+                    "source": article["source"],
+                    "is_fake": is_fake,
+                    "confidence": confidence,
+                    "explanation": explanation,
+                    "cached": cached
+                }
+            except Exception as e:
+                stats["errors"] += 1
+                result = {"index": index, "title": article["title"], "error": str(e)}
+            stats["scored"] += 1
+            finished[index] = (article, result)
+            await write_ready()
+
+    async def report_progress():
+        while True:
+            await asyncio.sleep(PROGRESS_INTERVAL_SECONDS)
+            elapsed_minutes = (time.monotonic() - started) / 60
+            per_minute = stats["scored"] / elapsed_minutes if elapsed_minutes else 0
+            remaining = total - start_index - stats["scored"]
+            eta_minutes = remaining / per_minute if per_minute else float("inf")
+            rate_limited = GEMINI_STATS["rate_limited"] / GEMINI_STATS["calls"] if GEMINI_STATS["calls"] else 0
+            print(f"{start_index + stats['scored']}/{total} articles | {per_minute:.0f} articles/min | "
+                  f"429 rate {rate_limited:.1%} | {stats['cached']} cached | {stats['errors']} errors | "
+                  f"ETA {eta_minutes:.0f} min")
+
+    progress_task = asyncio.create_task(report_progress())
+    try:
+        await asyncio.gather(producer(), *(worker() for _ in range(concurrency)))
+        async with write_lock:
+            await save_reports()
+    finally:
+        progress_task.cancel()
+        output.close()
+
+    elapsed_minutes = max((time.monotonic() - started) / 60, 1e-6)
+    print(f"Scored {stats['scored']} articles in {elapsed_minutes:.1f} min "
+          f"({stats['scored'] / elapsed_minutes:.0f} articles/min, {stats['cached']} from cache, "
+          f"{stats['errors']} errors, {GEMINI_STATS['rate_limited']} rate-limited calls)")
+    if stats["errors"]:
+        print(f"{stats['errors']} articles failed after {ERROR_ATTEMPTS} attempts and were written as error rows; "
+              "a resumed run does not retry them, so score them again from a file of those articles")
+    os.remove(checkpoint_path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a CSV or JSONL file of articles with Gemini")
+    parser.add_argument("input", help="CSV (title, content, source columns) or JSONL file")
+    parser.add_argument("output", help="JSONL file for the results")
+    parser.add_argument(
+        "--concurrency", type=int, default=len(API_KEYS) * 2,
+        help="Gemini requests in flight (default: 2 per API key)"
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Reports per insert into the database")
+    parser.add_argument("--no-store", action="store_true", help="Only write the output file")
+    args = parser.parse_args()
+
+    concurrency = max(1, min(args.concurrency, GEMINI_MAX_PENDING))
+    asyncio.run(bulk_score(args.input, args.output, concurrency, args.batch_size, store=not args.no_store))
@@ -0,0 +1,152 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+# Allow importing the app package when run as "python scripts/evaluate_cascade.py"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The stand-in below replaces the API, so no real key is needed
+os.environ.setdefault("GEMINI_API_KEY", "local-stub")
+
+from app.services import gemini_service
+
+# USD per million (input, output) tokens, used to turn token counts into cost.
+# Adjust to the pricing of the models configured for each tier.
+TIER_PRICES = {"single": (0.10, 0.40), "fast": (0.075, 0.30), "strong": (0.10, 0.40)}
+
+
+class StubGemini:
+    """
+    Local Gemini stand-in with per-tier latency and answers.
+
+    Each article gets a fixed hidden verdict and difficulty from its hash.
+    The fast tier is unsure (confidence 0.4-0.6) about the ambiguous share of
+    articles and sometimes returns unreadable output; the strong tier is
+    decisive but slower and more verbose. Latencies are log-normal around the
+    tier medians and are slept scaled by time_scale.
+    """
+
+    uses_api_keys = False
+
+    def __init__(self, fast_median, strong_median, ambiguous_share, parse_failure_rate, time_scale):
+        self.medians = {"fast": fast_median, "strong": strong_median}
+        self.ambiguous_share = ambiguous_share
+        self.parse_failure_rate = parse_failure_rate
+        self.time_scale = time_scale
+
+    def generate(self, model_name, config, prompt):
+        tier = "fast" if model_name == gemini_service.CASCADE_FAST_MODEL else "strong"
+        article = prompt.split("Title:", 1)[-1].split("Set is_fake", 1)[0].split("Please provide", 1)[0]
+        seed = int(hashlib.sha256(article.encode("utf-8")).hexdigest(), 16)
+        article_rng = random.Random(seed)
+        is_fake = article_rng.random() < 0.5
+        ambiguous = article_rng.random() < self.ambiguous_share
+        rng = random.Random(f"{seed}-{tier}")
+
+        latency = self.medians[tier] * math.exp(rng.gauss(0, 0.35))
+        time.sleep(latency * self.time_scale)
+
+        if tier == "fast" and ambiguous:
+            confidence = rng.uniform(0.4, 0.6)
+        elif tier == "fast":
+            confidence = rng.uniform(0.75, 0.95) if is_fake else rng.uniform(0.05, 0.25)
+        else:
+            confidence = rng.uniform(0.65, 0.9) if is_fake else rng.uniform(0.1, 0.35)
+
+        explanation_words = 30 if tier == "fast" else 120
+        text = json.dumps({
+            "is_fake": confidence > 0.5,
+            "confidence": round(confidence, 2),
+            "explanation": " ".join(["reason"] * explanation_words)
+        })
+        if tier == "fast" and rng.random() < self.parse_failure_rate:
+            text = text[:len(text) // 2]  # cut off mid-answer
+
+        usage = SimpleNamespace(
+            prompt_token_count=len(prompt) // 4,
+            candidates_token_count=len(text) // 4
+        )
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+def load_articles(path, count):
+    if path:
+        with open(path, "r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file if line.strip()][:count]
+    return [
+        {"title": f"Sample article {i}", "content": f"Body text of sample article number {i}."}
+        for i in range(count)
+    ]
+
+
+def reset_tier_stats():
+    for stats in gemini_service.TIER_STATS.values():
+        for name in stats:
+            stats[name] = 0
+
+
+def tier_cost(stats, tier):
+    input_price, output_price = TIER_PRICES[tier]
+    return (stats["prompt_tokens"] * input_price + stats["output_tokens"] * output_price) / 1e6
+
+
+async def run_mode(label, cascade, articles, time_scale):
+    gemini_service.CASCADE_ENABLED = cascade
+    reset_tier_stats()
+
+    latencies = []
+    for article in articles:
+        started = time.perf_counter()
+        await gemini_service.classify_news(article["title"], article["content"], allow_fallback=False)
+        latencies.append((time.perf_counter() - started) / time_scale)
+
+    latencies.sort()
+    tiers = gemini_service.tier_stats()
+    fast = tiers["fast"]
+    escalation_rate = fast["escalations"] / fast["calls"] if fast["calls"] else 0.0
+    cost = sum(tier_cost(tiers[tier], tier) for tier in tiers)
+    p90 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))]
+
+    print(f"{label:<8} latency mean={statistics.mean(latencies):.2f}s p50={statistics.median(latencies):.2f}s "
+          f"p90={p90:.2f}s | escalation rate={escalation_rate:.1%} | "
+          f"cost per 1000 articles=${cost / len(articles) * 1000:.4f}")
+    for tier, stats in tiers.items():
+        if stats["calls"]:
+            print(f"  {tier:<6} calls={stats['calls']:<5} avg latency={stats['avg_latency_seconds'] / time_scale:.2f}s "
+                  f"tokens in={stats['prompt_tokens']} out={stats['output_tokens']}")
+
+
+async def evaluate(args):
+    gemini_service.TRANSPORT = StubGemini(
+        args.fast_latency, args.strong_latency, args.ambiguous_share, args.parse_failure_rate, args.time_scale
+    )
+    articles = load_articles(args.input, args.count)
+    print(f"{len(articles)} articles, fast tier {gemini_service.CASCADE_FAST_MODEL}, "
+          f"strong tier {gemini_service.CASCADE_STRONG_MODEL}, uncertain band "
+          f"{gemini_service.CASCADE_UNCERTAIN_LOW}-{gemini_service.CASCADE_UNCERTAIN_HIGH}")
+    await run_mode("single", False, articles, args.time_scale)
+    await run_mode("cascade", True, articles, args.time_scale)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare single-model and cascaded classification against a local Gemini stand-in"
+    )
+    parser.add_argument("--input", help="JSONL file of articles with title and content (default: synthetic articles)")
+    parser.add_argument("--count", type=int, default=200, help="Number of articles to classify per mode")
+    parser.add_argument("--fast-latency", type=float, default=0.45, help="Median fast tier latency in seconds")
+    parser.add_argument("--strong-latency", type=float, default=1.6, help="Median strong tier latency in seconds")
+    parser.add_argument("--ambiguous-share", type=float, default=0.2, help="Share of articles the fast tier is unsure about")
+    parser.add_argument("--parse-failure-rate", type=float, default=0.02, help="Share of unreadable fast tier answers")
+    parser.add_argument("--time-scale", type=float, default=0.02, help="Fraction of the simulated latency actually slept")
+    args = parser.parse_args()
+
+    asyncio.run(evaluate(args))
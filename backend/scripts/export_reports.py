@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Allow importing the app package when run as "python scripts/export_reports.py"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.transfer_service import iter_export_lines
+
+async def export_reports(output, include_archive=True):
+    """Write every report to an NDJSON file, streaming from the database"""
+    print(f"Exporting reports to {output}...")
+    started = time.monotonic()
+    count = 0
+    
+    with open(output, "w", encoding="utf-8") as file:
+        async for line in iter_export_lines(include_archive=include_archive):
+            file.write(line)
+            count += 1
+            if count % 10000 == 0:
+                elapsed = time.monotonic() - started
+                print(f"{count} reports exported ({count / elapsed:.0f} reports/s)")
+    
+    elapsed = max(time.monotonic() - started, 1e-6)
+    print(f"Exported {count} reports in {elapsed:.1f}s ({count / elapsed:.0f} reports/s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export reports as NDJSON")
+    parser.add_argument("output", help="Path of the NDJSON file to write")
+    parser.add_argument("--no-archive", action="store_true", help="Skip archived reports")
+    args = parser.parse_args()
+    
+    asyncio.run(export_reports(args.output, include_archive=not args.no_archive))
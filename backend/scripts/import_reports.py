@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+import os
+import sys
+
+# Allow importing the app package when run as "python scripts/import_reports.py"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.transfer_service import import_reports, IMPORT_BATCH_SIZE
+
+async def run_import(path, batch_size, checkpoint):
+    print(f"Importing reports from {path}...")
+    records, inserted = await import_reports(path, batch_size=batch_size, checkpoint_path=checkpoint)
+    print(f"Import completed: {records} records read, {inserted} inserted")
+    
+    # The import finished, so the next one should start from the beginning
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Import reports from an NDJSON export or a JSON array file"
+    )
+    parser.add_argument("path", help="File to import")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Reports per insert_many call")
+    parser.add_argument(
+        "--checkpoint",
+        help="Progress file used to resume an interrupted import (default: <path>.checkpoint)"
+    )
+    args = parser.parse_args()
+    
+    asyncio.run(run_import(args.path, args.batch_size, args.checkpoint or f"{args.path}.checkpoint"))
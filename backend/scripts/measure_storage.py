@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Allow importing the app package when run as "python scripts/measure_storage.py"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config.mongodb import db
+from app.services.report_service import get_recent_reports
+
+COLLECTIONS = ["reports", "report_bodies", "reports_archive"]
+
+async def print_collection_sizes():
+    for name in COLLECTIONS:
+        stats = await db.command("collStats", name)
+        print(f"{name:<16} {stats.get('count', 0):>9} docs | "
+              f"data {stats.get('size', 0) / 1e6:8.1f} MB | "
+              f"storage {stats.get('storageSize', 0) / 1e6:8.1f} MB | "
+              f"avg doc {stats.get('avgObjSize', 0):6.0f} B")
+
+async def time_recent_reports(limit, runs, include_body):
+    latencies = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await get_recent_reports(limit, include_body=include_body)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    p90 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))]
+    label = "with bodies" if include_body else "summaries"
+    print(f"recent({limit}) {label:<12} p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p90={p90 * 1000:.1f}ms over {runs} runs")
+
+async def measure(limit, runs):
+    await print_collection_sizes()
+    await time_recent_reports(limit, runs, include_body=False)
+    await time_recent_reports(limit, runs, include_body=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Print report collection sizes and recent-reports latency, e.g. before and after a migration"
+    )
+    parser.add_argument("--limit", type=int, default=100, help="Reports per recent-reports query")
+    parser.add_argument("--runs", type=int, default=20, help="Timed queries per mode")
+    args = parser.parse_args()
+
+    asyncio.run(measure(args.limit, args.runs))
@@ -0,0 +1,17 @@
+import argparse
+import asyncio
+import os
+import sys
+
+# Allow importing the app package when run as "python scripts/migrate.py"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.migrations.runner import run_migrations
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply pending database migrations")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the documents each migration would change")
+    parser.add_argument("--target", type=int, help="Stop after this migration version")
+    args = parser.parse_args()
+    
+    asyncio.run(run_migrations(dry_run=args.dry_run, target=args.target))
@@ -1,42 +1,31 @@
 import asyncio
-import json
 import os
-from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorClient
+import sys
 
-# MongoDB connection settings
-MONGODB_URL = os.getenv("MONGODB_URL")
-DATABASE_NAME = os.getenv("DATABASE_NAME", "fake_news_detection")
+# Allow importing the app package when run as "python scripts/migrate_to_mongodb.py"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.transfer_service import import_reports
 
 # Path to reports.json
 REPORTS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app", "data", "reports.json")
+CHECKPOINT_FILE = REPORTS_FILE + ".checkpoint"
 
 async def migrate_data():
-    # Connect to MongoDB
-    client = AsyncIOMotorClient(MONGODB_URL)
-    db = client[DATABASE_NAME]
-    reports_collection = db.reports
-    
     # Load existing reports
     if not os.path.exists(REPORTS_FILE):
         print("No existing reports file found.")
         return
     
-    with open(REPORTS_FILE, 'r') as file:
-        reports = json.load(file)
-    
-    # Convert timestamps to datetime objects
-    for report in reports:
-        report["timestamp"] = datetime.fromisoformat(report["timestamp"])
-        # Remove the old id as MongoDB will generate a new one
-        report.pop("id", None)
-    
-    # Insert reports into MongoDB
-    if reports:
-        result = await reports_collection.insert_many(reports)
-        print(f"Successfully migrated {len(result.inserted_ids)} reports to MongoDB")
+    # Stream the file into MongoDB in batches; rerunning resumes from the checkpoint
+    records, inserted = await import_reports(REPORTS_FILE, checkpoint_path=CHECKPOINT_FILE)
+    if records:
+        print(f"Successfully migrated {inserted} reports to MongoDB")
     else:
         print("No reports to migrate")
+    
+    if os.path.exists(CHECKPOINT_FILE):
+        os.remove(CHECKPOINT_FILE)
 
 if __name__ == "__main__":
-    asyncio.run(migrate_data()) 
\ No newline at end of file
+    asyncio.run(migrate_data())
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Allow importing the app package when pytest is run from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The Gemini service is configured at import; tests never reach the API
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
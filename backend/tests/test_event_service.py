@@ -0,0 +1,50 @@
+import asyncio
+
+from app.services import event_service
+from app.services.event_service import EventBroadcaster, STREAM_MAX_LAGS, STREAM_QUEUE_SIZE
+
+
+def _publish(broadcaster, count):
+    for i in range(count):
+        broadcaster.publish("report", {"n": i})
+
+
+def test_subscriber_that_never_reads_is_dropped():
+    async def run():
+        broadcaster = EventBroadcaster()
+        subscription = broadcaster.subscribe()
+
+        # The queue first overflows on publish STREAM_QUEUE_SIZE + 1, and then
+        # every STREAM_QUEUE_SIZE publishes, since a resync frame stays queued
+        _publish(broadcaster, STREAM_QUEUE_SIZE * STREAM_MAX_LAGS + 1)
+        assert subscription in broadcaster.subscribers
+        assert subscription.lags == STREAM_MAX_LAGS
+
+        _publish(broadcaster, STREAM_QUEUE_SIZE)
+        assert subscription not in broadcaster.subscribers
+        assert subscription.queue.get_nowait() is event_service._CLOSE
+
+    asyncio.run(run())
+
+
+def test_subscriber_that_catches_up_is_kept():
+    async def run():
+        broadcaster = EventBroadcaster()
+        subscription = broadcaster.subscribe()
+
+        async def is_disconnected():
+            return False
+
+        frames = broadcaster.stream(subscription, is_disconnected)
+        await frames.__anext__()  # retry hint
+        for _ in range(STREAM_MAX_LAGS + 2):
+            _publish(broadcaster, STREAM_QUEUE_SIZE + 1)
+            assert subscription.lags == 1
+            # Drain the backlog: the resync frame and what followed it
+            while not subscription.queue.empty():
+                await frames.__anext__()
+            assert subscription.lags == 0
+        assert subscription in broadcaster.subscribers
+        await frames.aclose()
+
+    asyncio.run(run())
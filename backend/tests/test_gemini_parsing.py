@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from app.services.gemini_service import (
+    AnalysisParseError,
+    ClassificationParseError,
+    parse_classification_with_analysis,
+)
+
+
+def _verdict(explanation):
+    return json.dumps({"is_fake": True, "confidence": 0.8, "explanation": explanation})[:-1]
+
+
+def test_truncated_analysis_keeps_the_verdict():
+    text = _verdict("Unsourced claims.") + ', "analysis": {"summary": "The art'
+    with pytest.raises(AnalysisParseError) as excinfo:
+        parse_classification_with_analysis(text)
+    assert excinfo.value.classification == (True, 0.8, "Unsourced claims.")
+
+
+def test_analysis_quoted_in_the_explanation_is_not_the_key():
+    explanation = 'The "analysis", it cites is missing.'
+    text = _verdict(explanation) + ', "analysis": {"summary": "The art'
+    with pytest.raises(AnalysisParseError) as excinfo:
+        parse_classification_with_analysis(text)
+    assert excinfo.value.classification == (True, 0.8, explanation)
+
+
+def test_analysis_as_a_value_is_not_the_key():
+    text = _verdict("Unsourced claims.") + ', "section": "analysis", "analysis": {"summary": "The art'
+    with pytest.raises(AnalysisParseError) as excinfo:
+        parse_classification_with_analysis(text)
+    assert excinfo.value.classification == (True, 0.8, "Unsourced claims.")
+
+
+def test_cut_inside_the_explanation_is_not_salvaged():
+    text = _verdict('The "analysis", it cites is missing.')[:-12]
+    with pytest.raises(ClassificationParseError) as excinfo:
+        parse_classification_with_analysis(text)
+    assert not isinstance(excinfo.value, AnalysisParseError)
@@ -0,0 +1,107 @@
+import time
+import queue
+import multiprocessing
+from collections import Counter
+
+import pytest
+
+from app.services.quota_ledger import QuotaLedger, QuotaExhausted
+
+KEY_IDS = ["key-a", "key-b", "key-c"]
+LIMIT = 5
+WINDOW = 1.0
+RUN_SECONDS = 2.5
+WORKERS = 6
+# acquire reads the clock before it waits for the lock, so a grant read just
+# before a window ends can still join the window opened meanwhile
+LOCK_SLACK = 0.05
+
+
+def fake_gemini(key_id):
+    """Stand-in for an API call: takes a little time and answers"""
+    time.sleep(0.005)
+    return f"ok from {key_id}"
+
+
+def _worker(path, start, deadline, grants):
+    ledger = QuotaLedger(path, limit=LIMIT, window=WINDOW, cooldown=WINDOW)
+    time.sleep(max(0.0, start - time.time()))
+    while time.time() < deadline:
+        # acquire stamps the grant with the time it reads on entry
+        granted_at = time.time()
+        try:
+            index = ledger.acquire(KEY_IDS)
+        except QuotaExhausted:
+            time.sleep(0.01)
+            continue
+        fake_gemini(KEY_IDS[index])
+        grants.put((KEY_IDS[index], granted_at))
+
+
+def _run_workers(path, workers=WORKERS):
+    context = multiprocessing.get_context("spawn")
+    grants = context.Queue()
+    # Create the table before the workers race to open the file
+    QuotaLedger(path, limit=LIMIT, window=WINDOW)
+    # Leave time for the spawned workers to start so they all begin together
+    start = time.time() + 1.0
+    deadline = start + RUN_SECONDS
+    processes = [
+        context.Process(target=_worker, args=(path, start, deadline, grants))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    result = []
+    while any(process.is_alive() for process in processes) or not grants.empty():
+        try:
+            result.append(grants.get(timeout=0.1))
+        except queue.Empty:
+            pass
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    return result
+
+
+def _grants_per_window(times):
+    """Grant counts of the ledger windows, each opened by the first grant after the last one ended"""
+    windows = []
+    for granted_at in sorted(times):
+        if not windows or granted_at >= windows[-1][0] + WINDOW:
+            windows.append([granted_at, 0])
+        if granted_at < windows[-1][0] + WINDOW - LOCK_SLACK:
+            windows[-1][1] += 1
+    return [count for _, count in windows]
+
+
+def test_grants_per_key_stay_within_limit_across_processes(tmp_path):
+    grants = _run_workers(str(tmp_path / "quota.sqlite3"))
+
+    for key in KEY_IDS:
+        per_window = _grants_per_window([t for k, t in grants if k == key])
+        # The run spans several windows and no window goes over the limit
+        assert len(per_window) >= int(RUN_SECONDS / WINDOW)
+        assert max(per_window) <= LIMIT, per_window
+        # The workers are far faster than the limit, so the first window fills up
+        assert per_window[0] == LIMIT
+
+
+def test_cooldown_applies_to_every_process(tmp_path):
+    path = str(tmp_path / "quota.sqlite3")
+    QuotaLedger(path, limit=LIMIT, window=WINDOW).cooldown("key-a", seconds=60)
+
+    per_key = Counter(key for key, _ in _run_workers(path, workers=3))
+
+    assert per_key["key-a"] == 0
+    assert per_key["key-b"] > 0 and per_key["key-c"] > 0
+
+
+def test_exhausted_ledger_reports_retry_after(tmp_path):
+    ledger = QuotaLedger(str(tmp_path / "quota.sqlite3"), limit=1, window=30)
+    ledger.acquire(KEY_IDS[:1])
+
+    with pytest.raises(QuotaExhausted) as error:
+        ledger.acquire(KEY_IDS[:1])
+    assert 1 <= error.value.retry_after <= 30
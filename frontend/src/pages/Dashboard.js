@@ -17,7 +17,7 @@ import {
   Tabs,
   Tab,
 } from '@mui/material';
-import { getStatistics } from '../services/api';
+import { getStatistics, subscribeToReports } from '../services/api';
 
 function Dashboard() {
   const [loading, setLoading] = useState(true);
@@ -30,6 +30,35 @@ function Dashboard() {
     fetchStatistics();
   }, [timeRange]);
 
+  // Apply counter deltas pushed by the server instead of polling
+  useEffect(() => {
+    const unsubscribe = subscribeToReports({
+      onReport: ({ delta }) => setStats((current) => applyReportDelta(current, delta)),
+      onResync: () => fetchStatistics(),
+    });
+    return unsubscribe;
+  }, [timeRange]);
+
+  const addCounts = (counts = { real: 0, fake: 0, total: 0 }, delta) => ({
+    real: counts.real + delta.real,
+    fake: counts.fake + delta.fake,
+    total: counts.total + delta.total,
+  });
+
+  const applyReportDelta = (current, delta) => {
+    if (!current) return current;
+    const dailyCounts = delta.date
+      ? { ...current.daily_counts, [delta.date]: addCounts(current.daily_counts[delta.date], delta) }
+      : current.daily_counts;
+    return {
+      ...current,
+      total_count: addCounts(current.total_count, delta),
+      recent_count: addCounts(current.recent_count, delta),
+      by_source: { ...current.by_source, [delta.source]: addCounts(current.by_source[delta.source], delta) },
+      daily_counts: dailyCounts,
+    };
+  };
+
   const fetchStatistics = async () => {
     setLoading(true);
     setError('');
@@ -32,7 +32,7 @@ import {
 import CheckCircleIcon from '@mui/icons-material/CheckCircle';
 import CancelIcon from '@mui/icons-material/Cancel';
 import InfoIcon from '@mui/icons-material/Info';
-import { getReports } from '../services/api';
+import { getReports, getReport, subscribeToReports } from '../services/api';
 
 function Reports() {
   const [loading, setLoading] = useState(true);
@@ -44,14 +44,29 @@ function Reports() {
   const [dialogOpen, setDialogOpen] = useState(false);
   const [tabValue, setTabValue] = useState(0);
   const [filterFakeOnly, setFilterFakeOnly] = useState(false);
+  const [newReportCount, setNewReportCount] = useState(0);
 
   useEffect(() => {
     fetchReports();
   }, [filterFakeOnly]);
 
+  // Count reports pushed by the server so the list can be refreshed on demand
+  useEffect(() => {
+    const unsubscribe = subscribeToReports({
+      onReport: ({ report }) => {
+        if (!filterFakeOnly || report.is_fake) {
+          setNewReportCount((count) => count + 1);
+        }
+      },
+      onResync: () => setNewReportCount((count) => count + 1),
+    });
+    return unsubscribe;
+  }, [filterFakeOnly]);
+
   const fetchReports = async () => {
     setLoading(true);
     setError('');
+    setNewReportCount(0);
     try {
       // Fetch a large number of reports to handle client-side pagination
       const data = await getReports(100, filterFakeOnly);
@@ -74,9 +89,19 @@ function Reports() {
     setPage(0);
   };
 
-  const handleOpenReportDialog = (report) => {
+  const handleOpenReportDialog = async (report) => {
     setSelectedReport(report);
     setDialogOpen(true);
+
+    // The report list only carries summaries; load the full text on demand
+    if (report.explanation === undefined || report.explanation === null) {
+      try {
+        const fullReport = await getReport(report.id);
+        setSelectedReport((current) => (current && current.id === report.id ? fullReport : current));
+      } catch (err) {
+        console.error('Error loading report details:', err);
+      }
+    }
   };
 
   const handleCloseDialog = () => {
@@ -163,6 +188,20 @@ function Reports() {
         </Alert>
       )}
 
+      {newReportCount > 0 && (
+        <Alert
+          severity="info"
+          sx={{ my: 2 }}
+          action={
+            <Button color="inherit" size="small" onClick={fetchReports}>
+              Refresh
+            </Button>
+          }
+        >
+          New reports are available.
+        </Alert>
+      )}
+
       {!loading && reports.length === 0 && (
         <Paper sx={{ p: 4, textAlign: 'center' }}>
           <Typography variant="h6" color="textSecondary">
@@ -357,7 +396,7 @@ function Reports() {
                         <Typography variant="body2" sx={{ whiteSpace: 'pre-wrap' }}>
                           {truncateText(selectedReport.explanation, 300)}
                         </Typography>
-                        {selectedReport.explanation.length > 300 && (
+                        {(selectedReport.explanation || '').length > 300 && (
                           <Button
                             size="small"
                             onClick={() => setTabValue(2)}
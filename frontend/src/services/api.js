@@ -9,14 +9,43 @@ const api = axios.create({
   },
 });
 
+const MAX_NETWORK_RETRIES = 2;
+
+const newIdempotencyKey = () => (
+  window.crypto && window.crypto.randomUUID
+    ? window.crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`
+);
+
+/**
+ * POST that is retried on network errors with the same Idempotency-Key,
+ * so a retry never analyzes the same content twice
+ */
+const postIdempotent = async (url, data, options = {}) => {
+  const headers = { ...options.headers, 'Idempotency-Key': newIdempotencyKey() };
+  for (let attempt = 0; ; attempt += 1) {
+    try {
+      return await api.post(url, data, { ...options, headers });
+    } catch (error) {
+      if (error.response || attempt >= MAX_NETWORK_RETRIES) {
+        throw error;
+      }
+      await new Promise((resolve) => setTimeout(resolve, 1000 * (attempt + 1)));
+    }
+  }
+};
+
 /**
  * Analyze news content for fake news detection
  * @param {Object} data - News data with title, content, and optional source
+ * @param {boolean} includeAnalysis - Also return the detailed analysis from the same request
  * @returns {Promise<Object>} - Analysis result
  */
-export const analyzeNews = async (data) => {
+export const analyzeNews = async (data, includeAnalysis = false) => {
   try {
-    const response = await api.post('/api/detect', data);
+    const response = await postIdempotent('/api/detect', data, {
+      params: includeAnalysis ? { include_analysis: true } : undefined,
+    });
     return response.data;
   } catch (error) {
     handleApiError(error);
@@ -33,7 +62,7 @@ export const uploadNewsFile = async (file) => {
     const formData = new FormData();
     formData.append('file', file);
 
-    const response = await api.post('/api/upload', formData, {
+    const response = await postIdempotent('/api/upload', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
@@ -84,6 +113,20 @@ export const getReports = async (limit = 10, fakeOnly = false) => {
   }
 };
 
+/**
+ * Get one report with its content, explanation and analysis
+ * @param {string} id - Report id
+ * @returns {Promise<Object>} - Full report
+ */
+export const getReport = async (id) => {
+  try {
+    const response = await api.get(`/api/reports/${id}`);
+    return response.data;
+  } catch (error) {
+    handleApiError(error);
+  }
+};
+
 /**
  * Analyze text content for detailed insights
  * @param {string} text - Text to analyze
@@ -101,6 +144,24 @@ export const analyzeTextContent = async (text) => {
   }
 };
 
+/**
+ * Subscribe to the live stream of newly stored reports
+ * @param {Object} handlers - onReport(event) for each new report, onResync() when events were dropped
+ * @returns {Function} - Call to close the subscription
+ */
+export const subscribeToReports = ({ onReport, onResync }) => {
+  const source = new EventSource(`${config.apiUrl}/api/stream`);
+
+  source.addEventListener('report', (message) => {
+    if (onReport) onReport(JSON.parse(message.data));
+  });
+  source.addEventListener('resync', () => {
+    if (onResync) onResync();
+  });
+
+  return () => source.close();
+};
+
 /**
  * Handle API errors
  * @param {Error} error - The error object
@@ -115,7 +176,8 @@ const handleApiError = (error) => {
     const message = error.response.data.detail || 'An error occurred on the server.';
     
     if (status === 429) {
-      throw new Error(`429 Rate limit exceeded: ${message}`);
+      const retryAfter = error.response.headers && error.response.headers['retry-after'];
+      throw new Error(`429 Rate limit exceeded: ${message}${retryAfter ? ` (retry in ${retryAfter}s)` : ''}`);
     } else if (status === 404) {
       throw new Error('The requested resource was not found.');
     } else if (status === 401 || status === 403) {